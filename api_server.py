@@ -3,15 +3,18 @@
 Web API Server for Feishu Bitable Button Triggers
 """
 import os
+import gc
+import time
 import json
 import logging
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 
 # 导入项目模块
-from src.workflow.executor import WorkflowExecutor
+from src.workflow.executor import WorkflowExecutor, WorkflowTimeoutHandler
 from src.chat_assistant.chat_assistant import ChatAssistant
 
 def cleanup_old_reports(reports_dir: str):
@@ -83,6 +86,9 @@ def safe_json_convert(obj):
         return [safe_json_convert(v) for v in obj]
     return obj
 
+# 服务启动时的工作目录（报告及 /files 文件服务均相对于该目录），转换文件URL时无需每次重新获取
+_CWD_AT_IMPORT = os.getcwd()
+
 def convert_local_path_to_url(file_path, base_url=None):
     """
     将本地文件路径转换为可访问的URL
@@ -99,9 +105,8 @@ def convert_local_path_to_url(file_path, base_url=None):
         return None
     
     # 获取相对于项目根目录的路径
-    project_root = os.getcwd()
     try:
-        rel_path = os.path.relpath(file_path, project_root)
+        rel_path = os.path.relpath(file_path, _CWD_AT_IMPORT)
         # 将Windows路径分隔符转换为URL格式
         url_path = rel_path.replace('\\', '/')
         
@@ -124,8 +129,9 @@ def convert_local_path_to_url(file_path, base_url=None):
         logger.warning(f"路径转换失败: {e}")
         return None
 
+@lru_cache(maxsize=1)
 def _get_smart_base_url():
-    """智能获取base URL"""
+    """智能获取base URL（仅依赖环境变量和启动目录，进程内只计算一次）"""
     # 优先从环境变量获取
     env_url = os.getenv('SERVER_BASE_URL')
     if env_url:
@@ -284,26 +290,27 @@ def execute_workflow():
         logger.info(f"收到工作流执行请求，来源IP: {request.remote_addr}")
         logger.info(f"请求方法: {request.method}")
         logger.info(f"请求URL: {request.url}")
-        logger.info(f"请求头: {dict(request.headers)}")
+        # 原始请求内容仅在DEBUG级别输出，参数按截断形式在下方统一打印
+        logger.debug("请求头: %s", request.headers)
         
         # 尝试从JSON请求体获取参数
         data = {}
         json_data = request.get_json(silent=True)
         if json_data:
             data.update(json_data)
-            logger.info(f"JSON请求体: {json_data}")
+            logger.debug("JSON请求体: %s", json_data)
         
         # 从URL query parameters获取参数
         query_params = request.args.to_dict()
         if query_params:
             data.update(query_params)
-            logger.info(f"Query参数: {query_params}")
+            logger.debug("Query参数: %s", query_params)
         
         # 从form data获取参数
         form_data = request.form.to_dict()
         if form_data:
             data.update(form_data)
-            logger.info(f"Form数据: {form_data}")
+            logger.debug("Form数据: %s", form_data)
         
         # 打印所有接收到的参数
         logger.info("=== 接收到的所有参数 ===")
@@ -345,90 +352,23 @@ def execute_workflow():
         web_url_raw = data.get('webUrl')
         
         # 解析webUrl参数，支持URL:XPath格式和@URL:XPath格式
-        website_url = None
-        xpath_selector = None
-        
         if web_url_raw:
             logger.info(f"原始webUrl: {web_url_raw}")
-            
-            # 处理@URL:XPath格式
-            if web_url_raw.startswith('@') and ':' in web_url_raw:
-                try:
-                    # 移除@符号
-                    url_xpath = web_url_raw[1:]
-                    logger.info(f"移除@后: {url_xpath}")
-                    
-                    # 查找第一个:的位置（URL后面的冒号）
-                    if '://' in url_xpath:
-                        protocol_end = url_xpath.find('://') + 3
-                        colon_pos = url_xpath.find(':', protocol_end)
-                        logger.info(f"协议结束位置: {protocol_end}, 冒号位置: {colon_pos}")
-                        
-                        if colon_pos != -1:
-                            website_url = url_xpath[:colon_pos]
-                            xpath_selector = url_xpath[colon_pos + 1:]
-                        else:
-                            website_url = url_xpath
-                    else:
-                        parts = url_xpath.split(':', 1)
-                        website_url = parts[0]
-                        xpath_selector = parts[1] if len(parts) > 1 else None
-                    
-                    logger.info(f"解析@URL:XPath格式 - URL: {website_url}, XPath: {xpath_selector}")
-                    
-                except Exception as e:
-                    logger.error(f"解析@URL:XPath格式失败: {e}")
-                    return jsonify({
-                        "success": False,
-                        "error": f"webUrl格式错误，无法解析@URL:XPath格式: {str(e)}",
-                        "webUrl": web_url_raw,
-                        "webUrlPath": ""
-                    }), 400
-            
-            # 处理直接的URL:XPath格式（不带@前缀）
-            elif ':' in web_url_raw and web_url_raw.startswith(('http://', 'https://')):
-                try:
-                    # 查找协议后的第一个冒号
-                    if '://' in web_url_raw:
-                        protocol_end = web_url_raw.find('://') + 3
-                        colon_pos = web_url_raw.find(':', protocol_end)
-                        
-                        if colon_pos != -1:
-                            website_url = web_url_raw[:colon_pos]
-                            xpath_selector = web_url_raw[colon_pos + 1:]
-                            logger.info(f"解析URL:XPath格式 - URL: {website_url}, XPath: {xpath_selector}")
-                        else:
-                            # 没有找到XPath分隔符，整个作为URL
-                            website_url = web_url_raw
-                            logger.info(f"使用完整URL: {website_url}")
-                    else:
-                        website_url = web_url_raw
-                        logger.info(f"使用完整URL: {website_url}")
-                    
-                except Exception as e:
-                    logger.error(f"解析URL:XPath格式失败: {e}")
-                    return jsonify({
-                        "success": False,
-                        "error": f"webUrl格式错误，无法解析URL:XPath格式: {str(e)}",
-                        "webUrl": web_url_raw
-                    }), 400
-            
-            else:
-                # 兼容旧格式，直接作为URL
-                website_url = web_url_raw
-                web_url_path = data.get('webUrlPath', '')
-                if web_url_path:
-                    if web_url_path.startswith(('http://', 'https://')):
-                        website_url = web_url_path
-                    else:
-                        website_url = f"{website_url.rstrip('/')}/{web_url_path.lstrip('/')}"
-                logger.info(f"使用传统URL格式: {website_url}")
+        try:
+            website_url, xpath_selector = _parse_web_url(data, allow_bare_xpath=True)
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e),
+                "webUrl": web_url_raw
+            }), 400
         
         # 可选参数（先获取测试类型）
         test_type = data.get('testType', '完整测试')  # 先获取测试类型，决定验证逻辑
         app_token = data.get('appToken', os.getenv('FEISHU_APP_TOKEN'))
         table_id = data.get('tableId', os.getenv('FEISHU_TABLE_ID'))
         record_id = data.get('recordId')
+        force_refresh = _parse_bool_flag(data, 'forceRefresh')  # 忽略PRD测试用例及Figma设计稿缓存
         
         # 处理设备类型 - 支持新的"是否是移动端"字段
         is_mobile = data.get('isMobile', data.get('是否是移动端'))  # 支持中英文字段名
@@ -545,7 +485,8 @@ def execute_workflow():
                 xpath_selector=xpath_selector,  # 新增XPath参数
                 device=device,
                 output_dir="reports",
-                test_type=test_type  # 新增测试类型参数
+                test_type=test_type,  # 新增测试类型参数
+                force_refresh=force_refresh
             )
             
             logger.info(f"{test_type}执行成功")
@@ -565,23 +506,25 @@ def execute_workflow():
             
             # 根据测试类型添加相应的结果
             if test_type == "功能测试" or test_type == "完整测试":
-                if result.get('test_cases'):
+                test_cases = result.get('test_cases')
+                if test_cases:
                     return_data["test_cases_result"] = safe_json_convert({
-                        "generated": result['test_cases'].get('api_status') == 'success',
-                        "api_status": result['test_cases'].get('api_status'),
-                        "prd_text_length": result['test_cases'].get('prd_text_length'),
-                        "generated_at": result['test_cases'].get('generated_at')
+                        "generated": test_cases.get('api_status') == 'success',
+                        "api_status": test_cases.get('api_status'),
+                        "prd_text_length": test_cases.get('prd_text_length'),
+                        "generated_at": test_cases.get('generated_at')
                     })
                 else:
                     return_data["test_cases_result"] = {"generated": False, "reason": "未执行或执行失败"}
             
             if test_type == "UI测试" or test_type == "完整测试":
-                if result.get('comparison_result'):
-                    comparison_data = result['comparison_result'].get('comparison_result', {})
+                workflow_comparison = result.get('comparison_result')
+                if workflow_comparison:
+                    comparison_data = workflow_comparison.get('comparison_result', {})
                     
                     # 转换图片路径为可访问的URL
-                    figma_image_path = result['comparison_result'].get('figma_screenshot')
-                    website_image_path = result['comparison_result'].get('website_screenshot')
+                    figma_image_path = workflow_comparison.get('figma_screenshot')
+                    website_image_path = workflow_comparison.get('website_screenshot')
                     diff_image_path = comparison_data.get('diff_image_path')
                     
                     return_data["comparison_result"] = safe_json_convert({
@@ -590,7 +533,7 @@ def execute_workflow():
                         "mse_score": comparison_data.get('mse_score', 0),
                         "hash_distance": comparison_data.get('hash_distance', 0),
                         "differences_count": comparison_data.get('differences_count', 0),
-                        "output_directory": result['comparison_result'].get('output_directory'),
+                        "output_directory": workflow_comparison.get('output_directory'),
                         "figma_image_path": figma_image_path,
                         "website_image_path": website_image_path,
                         "diff_image_path": diff_image_path,
@@ -621,6 +564,112 @@ def execute_workflow():
             "error": f"服务器内部错误: {str(e)}"
         }), 500
 
+def _parse_bool_flag(data, key, default=False):
+    """
+    解析布尔型请求参数，兼容JSON布尔值及表单/查询字符串中的"true"、"1"、"是"等写法
+    Parse a boolean request flag sent as a JSON bool or a form/query string
+    """
+    value = data.get(key)
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', '是')
+
+def _split_url_xpath(url_xpath):
+    """
+    按URL:XPath格式拆分，URL中可能包含:（如https:），因此取://之后的第一个:作为分隔符
+    Split "URL:XPath" at the first colon after the scheme
+    """
+    if '://' in url_xpath:
+        protocol_end = url_xpath.find('://') + 3
+        colon_pos = url_xpath.find(':', protocol_end)
+        if colon_pos != -1:
+            return url_xpath[:colon_pos], url_xpath[colon_pos + 1:]
+        # 没有找到XPath分隔符，整个作为URL
+        return url_xpath, None
+    # 没有协议，按第一个:分割
+    parts = url_xpath.split(':', 1)
+    return parts[0], parts[1] if len(parts) > 1 else None
+
+def _parse_web_url(data, allow_bare_xpath=False):
+    """
+    解析webUrl参数，支持@URL:XPath格式和旧格式(webUrl + webUrlPath)
+    Parse the webUrl parameter (@URL:XPath or legacy webUrl + webUrlPath)
+    
+    Args:
+        data: 请求参数 request parameters
+        allow_bare_xpath: 是否同时支持不带@前缀的 http(s)://URL:XPath 格式 (工作流接口使用)
+                          also accept "http(s)://URL:XPath" without the @ prefix
+    
+    Returns:
+        (website_url, xpath_selector)，格式错误时抛出 ValueError
+    """
+    web_url_raw = data.get('webUrl')
+    website_url = None
+    xpath_selector = None
+    
+    if web_url_raw:
+        if web_url_raw.startswith('@') and ':' in web_url_raw:
+            # 解析@URL:XPath格式
+            try:
+                website_url, xpath_selector = _split_url_xpath(web_url_raw[1:])
+                logger.info(f"解析@URL:XPath格式 - URL: {website_url}, XPath: {xpath_selector}")
+            except Exception as e:
+                logger.error(f"解析@URL:XPath格式失败: {e}")
+                raise ValueError(f"webUrl格式错误，无法解析@URL:XPath格式: {web_url_raw}")
+        elif allow_bare_xpath and ':' in web_url_raw and web_url_raw.startswith(('http://', 'https://')):
+            # 解析直接的URL:XPath格式（不带@前缀）
+            try:
+                website_url, xpath_selector = _split_url_xpath(web_url_raw)
+                logger.info(f"解析URL:XPath格式 - URL: {website_url}, XPath: {xpath_selector}")
+            except Exception as e:
+                logger.error(f"解析URL:XPath格式失败: {e}")
+                raise ValueError(f"webUrl格式错误，无法解析URL:XPath格式: {web_url_raw}")
+        else:
+            # 兼容旧格式，直接作为URL
+            website_url = web_url_raw
+            web_url_path = data.get('webUrlPath', '')
+            if web_url_path:
+                if web_url_path.startswith(('http://', 'https://')):
+                    website_url = web_url_path
+                else:
+                    website_url = f"{website_url.rstrip('/')}/{web_url_path.lstrip('/')}"
+            logger.info(f"使用传统URL格式: {website_url}")
+    
+    return website_url, xpath_selector
+
+def _comparison_response_data(figma_url, website_url, xpath_selector, device, comparison_result):
+    """
+    将视觉比较结果整理为API响应数据，图片路径转换为可访问的URL
+    Build the API response payload for a visual comparison result
+    """
+    # 转换图片路径为可访问的URL
+    figma_image_path = comparison_result.get('figma_screenshot')
+    website_image_path = comparison_result.get('website_screenshot')
+    comparison_data = comparison_result.get('comparison_result', {})
+    diff_image_path = comparison_data.get('diff_image_path')
+    
+    return safe_json_convert({
+        "figma_url": figma_url,
+        "website_url": website_url,
+        "xpath_selector": xpath_selector,
+        "device": device,
+        "similarity_score": comparison_data.get('similarity_score', 0),
+        "ssim_score": comparison_data.get('ssim_score', 0),
+        "mse_score": comparison_data.get('mse_score', 0),
+        "hash_distance": comparison_data.get('hash_distance', 0),
+        "differences_count": comparison_data.get('differences_count', 0),
+        "output_directory": comparison_result.get('output_directory'),
+        "figma_image_path": figma_image_path,
+        "website_image_path": website_image_path,
+        "diff_image_path": diff_image_path,
+        "figma_image_url": convert_local_path_to_url(figma_image_path),
+        "website_image_url": convert_local_path_to_url(website_image_path),
+        "diff_image_url": convert_local_path_to_url(diff_image_path),
+        "completed_at": datetime.now().isoformat()
+    })
+
 @app.route('/api/execute-comparison', methods=['POST'])
 def execute_comparison():
     """
@@ -637,53 +686,15 @@ def execute_comparison():
         
         # 提取参数
         figma_url = data.get('figmaUrl')
-        web_url_raw = data.get('webUrl')
         
         # 解析webUrl参数，支持@URL:XPath格式
-        website_url = None
-        xpath_selector = None
-        
-        if web_url_raw:
-            if web_url_raw.startswith('@') and ':' in web_url_raw:
-                # 解析@URL:XPath格式
-                try:
-                    # 移除@符号
-                    url_xpath = web_url_raw[1:]
-                    
-                    # 查找第一个:的位置（URL后面的冒号）
-                    # 由于URL中可能包含:（如https:），我们需要找到://后面的第一个:
-                    if '://' in url_xpath:
-                        protocol_end = url_xpath.find('://') + 3
-                        colon_pos = url_xpath.find(':', protocol_end)
-                        if colon_pos != -1:
-                            website_url = url_xpath[:colon_pos]
-                            xpath_selector = url_xpath[colon_pos + 1:]
-                        else:
-                            # 没有找到XPath分隔符，整个作为URL
-                            website_url = url_xpath
-                    else:
-                        # 没有协议，按第一个:分割
-                        parts = url_xpath.split(':', 1)
-                        website_url = parts[0]
-                        xpath_selector = parts[1] if len(parts) > 1 else None
-                    
-                    logger.info(f"解析@URL:XPath格式 - URL: {website_url}, XPath: {xpath_selector}")
-                except Exception as e:
-                    logger.error(f"解析@URL:XPath格式失败: {e}")
-                    return jsonify({
-                        "success": False,
-                        "error": f"webUrl格式错误，无法解析@URL:XPath格式: {web_url_raw}"
-                    }), 400
-            else:
-                # 兼容旧格式，直接作为URL
-                website_url = web_url_raw
-                web_url_path = data.get('webUrlPath', '')
-                if web_url_path:
-                    if web_url_path.startswith(('http://', 'https://')):
-                        website_url = web_url_path
-                    else:
-                        website_url = f"{website_url.rstrip('/')}/{web_url_path.lstrip('/')}"
-                logger.info(f"使用传统URL格式: {website_url}")
+        try:
+            website_url, xpath_selector = _parse_web_url(data)
+        except ValueError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e)
+            }), 400
         
         # 验证必需参数
         if not figma_url or not website_url:
@@ -719,38 +730,16 @@ def execute_comparison():
             website_url=website_url,
             xpath_selector=xpath_selector,  # 新增XPath参数
             device=device,
-            output_dir="reports"
+            output_dir="reports",
+            force_refresh=_parse_bool_flag(data, 'forceRefresh')
         )
         
         logger.info("视觉比较执行成功")
         
-        # 转换图片路径为可访问的URL
-        figma_image_path = comparison_result.get('figma_screenshot')
-        website_image_path = comparison_result.get('website_screenshot')
-        diff_image_path = comparison_result.get('comparison_result', {}).get('diff_image_path')
-        
         return jsonify({
             "success": True,
             "message": "视觉比较执行成功",
-            "data": safe_json_convert({
-                "figma_url": figma_url,
-                "website_url": website_url,
-                "xpath_selector": xpath_selector,
-                "device": device,
-                "similarity_score": comparison_result.get('comparison_result', {}).get('similarity_score', 0),
-                "ssim_score": comparison_result.get('comparison_result', {}).get('ssim_score', 0),
-                "mse_score": comparison_result.get('comparison_result', {}).get('mse_score', 0),
-                "hash_distance": comparison_result.get('comparison_result', {}).get('hash_distance', 0),
-                "differences_count": comparison_result.get('comparison_result', {}).get('differences_count', 0),
-                "output_directory": comparison_result.get('output_directory'),
-                "figma_image_path": figma_image_path,
-                "website_image_path": website_image_path,
-                "diff_image_path": diff_image_path,
-                "figma_image_url": convert_local_path_to_url(figma_image_path),
-                "website_image_url": convert_local_path_to_url(website_image_path),
-                "diff_image_url": convert_local_path_to_url(diff_image_path),
-                "completed_at": datetime.now().isoformat()
-            })
+            "data": _comparison_response_data(figma_url, website_url, xpath_selector, device, comparison_result)
         })
         
     except Exception as e:
@@ -760,6 +749,19 @@ def execute_comparison():
             "error": f"视觉比较执行失败: {str(e)}"
         }), 500
 
+def _test_cases_response_data(doc_token, test_cases_result):
+    """
+    将测试用例生成结果整理为API响应数据
+    Build the API response payload for a test case generation result
+    """
+    return {
+        "document_token": doc_token,
+        "test_cases": test_cases_result.get('test_cases_text', ''),
+        "api_status": test_cases_result.get('api_status', 'unknown'),
+        "prd_text_length": test_cases_result.get('prd_text_length', 0),
+        "generated_at": test_cases_result.get('generated_at')
+    }
+
 @app.route('/api/generate-test-cases', methods=['POST'])
 def generate_test_cases():
     """
@@ -791,20 +793,16 @@ def generate_test_cases():
             }), 500
         
         # 生成测试用例
-        test_cases_result = workflow_executor._generate_test_cases_from_prd(doc_token)
+        test_cases_result = workflow_executor._generate_test_cases_from_prd(
+            doc_token, force_refresh=_parse_bool_flag(data, 'forceRefresh')
+        )
         
         logger.info("测试用例生成成功")
         
         return jsonify({
             "success": True,
             "message": "测试用例生成成功",
-            "data": {
-                "document_token": doc_token,
-                "test_cases": test_cases_result.get('test_cases_text', ''),
-                "api_status": test_cases_result.get('api_status', 'unknown'),
-                "prd_text_length": test_cases_result.get('prd_text_length', 0),
-                "generated_at": test_cases_result.get('generated_at')
-            }
+            "data": _test_cases_response_data(doc_token, test_cases_result)
         })
         
     except Exception as e:
@@ -814,6 +812,153 @@ def generate_test_cases():
             "error": f"测试用例生成失败: {str(e)}"
         }), 500
 
+# 单次批量请求允许的最大任务数，避免一个请求长时间占用执行器
+MAX_BATCH_JOBS = 10
+# 单次批量请求的总执行时间上限(秒)，超出后剩余任务不再执行，返回部分结果
+MAX_BATCH_EXECUTION_TIME = 600
+
+def _execute_batch_job(job, output_dir, figma_cache, timeout_seconds):
+    """
+    执行批量请求中的单个任务，失败或超时时返回错误信息而不中断整个批次
+    Execute a single job of a batch request within timeout_seconds
+    """
+    job_type = job.get('type') if isinstance(job, dict) else None
+    # 与工作流接口相同的超时机制，超时后关闭浏览器驱动
+    timeout_handler = WorkflowTimeoutHandler(
+        timeout_seconds, on_timeout=workflow_executor._cleanup_after_timeout
+    )
+    try:
+        if job_type == 'comparison':
+            figma_url = job.get('figmaUrl')
+            website_url, xpath_selector = _parse_web_url(job)
+            if not figma_url or not website_url:
+                raise ValueError("缺少必需参数: figmaUrl 或 webUrl")
+            if not website_url.startswith(('http://', 'https://')):
+                raise ValueError(f"无效的URL格式: {website_url}")
+            device = job.get('device', 'desktop')
+            
+            comparison_result = timeout_handler.run(
+                workflow_executor._compare_figma_and_website,
+                figma_url=figma_url,
+                website_url=website_url,
+                xpath_selector=xpath_selector,
+                device=device,
+                output_dir=output_dir,
+                figma_cache=figma_cache,
+                force_refresh=_parse_bool_flag(job, 'forceRefresh')
+            )
+            data = _comparison_response_data(figma_url, website_url, xpath_selector, device, comparison_result)
+        elif job_type == 'generate-test-cases':
+            doc_token = job.get('docToken')
+            if not doc_token:
+                raise ValueError("缺少必需参数: docToken")
+            
+            test_cases_result = timeout_handler.run(
+                workflow_executor._generate_test_cases_from_prd,
+                doc_token, force_refresh=_parse_bool_flag(job, 'forceRefresh')
+            )
+            data = _test_cases_response_data(doc_token, test_cases_result)
+        else:
+            raise ValueError(f"不支持的任务类型: {job_type}")
+        
+        return {"type": job_type, "success": True, "data": data}
+    except Exception as e:
+        logger.error(f"批量任务执行失败 ({job_type}): {e}")
+        return {"type": job_type, "success": False, "error": str(e)}
+
+@app.route('/api/execute-batch', methods=['POST'])
+def execute_batch():
+    """
+    批量执行视觉比较和测试用例生成任务的API端点
+    API endpoint for executing a batch of comparison and test case generation jobs
+    
+    请求体格式:
+    {"jobs": [{"type": "comparison", "figmaUrl": "...", "webUrl": "...", "device": "desktop"},
+              {"type": "generate-test-cases", "docToken": "..."}]}
+    
+    参数完全相同的任务只执行一次；同一批次中相同的Figma设计稿只获取一次。
+    每个任务受工作流超时限制，整个批次超过 MAX_BATCH_EXECUTION_TIME 后剩余任务不再执行，返回部分结果
+    """
+    try:
+        data = request.get_json(silent=True)
+        jobs = data.get('jobs') if isinstance(data, dict) else None
+        if not isinstance(jobs, list) or not jobs:
+            return jsonify({
+                "success": False,
+                "error": "缺少必需参数: jobs"
+            }), 400
+        
+        if len(jobs) > MAX_BATCH_JOBS:
+            return jsonify({
+                "success": False,
+                "error": f"任务数量超过上限: {len(jobs)} > {MAX_BATCH_JOBS}"
+            }), 400
+        
+        # 检查工作流执行器是否初始化
+        if workflow_executor is None:
+            return jsonify({
+                "success": False,
+                "error": "工作流执行器未初始化，请检查服务器配置"
+            }), 500
+        
+        logger.info(f"执行批量任务: {len(jobs)} 个")
+        
+        # 清理旧报告（只保留最新的一个），本批次的报告放在同一个comparison_目录下，每个任务一个子目录
+        cleanup_old_reports("reports")
+        batch_dir = os.path.join("reports", f"comparison_{int(datetime.now().timestamp())}")
+        
+        results = []
+        completed = {}  # 任务参数 -> 结果，重复任务直接复用
+        figma_cache = {}  # Figma URL -> 已下载的设计稿路径
+        deadline = time.monotonic() + MAX_BATCH_EXECUTION_TIME
+        skipped = 0
+        for index, job in enumerate(jobs):
+            job_key = json.dumps(job, sort_keys=True, ensure_ascii=False)
+            if job_key in completed:
+                logger.info(f"批量任务 {index} 与之前的任务相同，复用结果")
+                results.append(completed[job_key])
+                continue
+            
+            remaining = int(deadline - time.monotonic())
+            if remaining <= 0:
+                # 批次总时长已用完，剩余任务直接标记为未执行
+                skipped += 1
+                results.append({
+                    "type": job.get('type') if isinstance(job, dict) else None,
+                    "success": False,
+                    "error": f"批量任务总执行时间超过 {MAX_BATCH_EXECUTION_TIME} 秒，任务未执行"
+                })
+                continue
+            
+            result = _execute_batch_job(
+                job, os.path.join(batch_dir, f"job_{index}"), figma_cache,
+                timeout_seconds=min(workflow_executor.MAX_EXECUTION_TIME, remaining)
+            )
+            completed[job_key] = result
+            results.append(result)
+        
+        succeeded = sum(1 for result in results if result['success'])
+        if skipped:
+            logger.warning(f"批量任务超时，{skipped} 个任务未执行")
+        logger.info(f"批量任务执行完成: {succeeded}/{len(results)} 成功")
+        
+        return jsonify({
+            "success": True,
+            "message": f"批量任务执行完成: {succeeded}/{len(results)} 成功",
+            "data": {
+                "results": results,
+                "partial": skipped > 0,
+                "completed_at": datetime.now().isoformat()
+            }
+        })
+        
+    except Exception as e:
+        logger.error(f"批量任务执行失败: {e}")
+        return jsonify({
+            "success": False,
+            "error": f"批量任务执行失败: {str(e)}"
+        }), 500
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """
@@ -1121,9 +1266,17 @@ def internal_error(error):
         "error": "内部服务器错误"
     }), 500
 
+def configure_gc():
+    """
+    放宽分代回收阈值，减少处理大图时的回收停顿；完整回收只在组件清理后执行
+    进程级设置，只在服务启动时调用，不在创建执行器时修改
+    """
+    gc.set_threshold(1000, 15, 15)
+
 if __name__ == '__main__':
     # 确保日志目录存在
     os.makedirs('logs', exist_ok=True)
+    configure_gc()
     
     # 启动服务器
     host = os.getenv('API_HOST', '0.0.0.0')
@@ -1142,6 +1295,7 @@ if __name__ == '__main__':
     logger.info("    • 自动状态更新：未开始 → 进行中 → 已完成/失败")
     logger.info("  POST /api/execute-comparison - 执行视觉比较")
     logger.info("  POST /api/generate-test-cases - 生成测试用例")
+    logger.info("  POST /api/execute-batch - 批量执行视觉比较/测试用例生成")
     logger.info("  POST /api/reset-status - 重置执行状态为'未开始'")
     logger.info("  POST /api/chat - 聊天助手 (智能问答)")
     logger.info("  GET  /api/chat/history - 获取聊天历史")
@@ -12,15 +12,15 @@ from rich.panel import Panel
 import time
 
 # 添加项目根目录到Python路径
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+_PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 
 from src.utils.config import Config
 from src.utils.logger import get_logger
 from src.feishu.client import FeishuClient
-from src.ai_analysis.gemini_case_generator import GeminiCaseGenerator
 from src.screenshot.capture import ScreenshotCapture
 from src.figma.client import FigmaClient
-from src.visual_comparison.comparator import VisualComparator
 from src.workflow.executor import WorkflowExecutor
 
 def cleanup_old_reports(reports_dir: str):
@@ -236,7 +236,8 @@ def generate_cases(document_token, case_count, output):
         if not prd_text.strip():
             console.print("⚠️  文档内容为空，无法生成测试用例", style="yellow")
             return
-        # 2. 调用Gemini生成测试用例
+        # 2. 调用Gemini生成测试用例（按需导入Gemini SDK，其他命令无需加载）
+        from src.ai_analysis.gemini_case_generator import GeminiCaseGenerator
         generator = GeminiCaseGenerator()
         console.print(f"📄 正在分析文档并生成{case_count}条测试用例...", style="cyan")
         cases = generator.generate_test_cases(prd_text, case_count=case_count)
@@ -611,6 +612,7 @@ def compare_web_figma(website_url, figma_url, selector, classes, device, output_
         
         # 3. 进行视觉比对
         console.print("🔍 正在进行视觉比对...")
+        from src.visual_comparison.comparator import VisualComparator
         comparator = VisualComparator()
         
         try:
@@ -5,16 +5,26 @@ Chat Assistant Module
 提供自然语言交互功能，通过关键词识别自动执行测试操作
 """
 
-from .intent_recognizer import IntentRecognizer
-from .command_executor import CommandExecutor
-from .conversation_manager import ConversationManager
-from .response_formatter import ResponseFormatter
-from .chat_assistant import ChatAssistant
+import importlib
 
-__all__ = [
-    'IntentRecognizer',
-    'CommandExecutor', 
-    'ConversationManager',
-    'ResponseFormatter',
-    'ChatAssistant'
-] 
\ No newline at end of file
+# 名称 -> 子模块，首次访问时才导入，避免导入子模块时连带加载整个执行栈
+_LAZY_EXPORTS = {
+    'IntentRecognizer': '.intent_recognizer',
+    'CommandExecutor': '.command_executor',
+    'ConversationManager': '.conversation_manager',
+    'ResponseFormatter': '.response_formatter',
+    'ChatAssistant': '.chat_assistant',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
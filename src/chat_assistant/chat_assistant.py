@@ -64,7 +64,7 @@ class ChatAssistant:
             
             # 识别意图
             intent = self.intent_recognizer.recognize_intent(message)
-            logger.info(f"识别意图: {intent.type.value}, 置信度: {intent.confidence:.3f}")
+            logger.info("识别意图: %s, 置信度: %.3f", intent.type.value, intent.confidence)
             
             # 更新上下文中的意图
             self.conversation_manager.update_context(session_id, {'last_intent': intent.type.value})
@@ -127,11 +127,11 @@ class ChatAssistant:
                 'timestamp': datetime.now().isoformat()
             }
             
-            logger.info(f"消息处理完成: session={session_id}, success={execution_result.success}")
+            logger.info("消息处理完成: session=%s, success=%s", session_id, execution_result.success)
             return response
             
         except Exception as e:
-            logger.error(f"处理消息时发生错误: {e}")
+            logger.error("处理消息时发生错误: %s", e)
             
             # 创建错误响应
             error_response = {
@@ -151,17 +151,17 @@ class ChatAssistant:
             messages = self.conversation_manager.get_conversation_history(session_id, limit)
             return [message.to_dict() for message in messages]
         except Exception as e:
-            logger.error(f"获取对话历史失败: {e}")
+            logger.error("获取对话历史失败: %s", e)
             return []
     
     def clear_conversation(self, session_id: str) -> bool:
         """清除对话"""
         try:
             self.conversation_manager.clear_context(session_id)
-            logger.info(f"清除对话上下文: session={session_id}")
+            logger.info("清除对话上下文: session=%s", session_id)
             return True
         except Exception as e:
-            logger.error(f"清除对话失败: {e}")
+            logger.error("清除对话失败: %s", e)
             return False
     
     def get_conversation_summary(self, session_id: str) -> Dict[str, Any]:
@@ -169,7 +169,7 @@ class ChatAssistant:
         try:
             return self.conversation_manager.get_conversation_summary(session_id)
         except Exception as e:
-            logger.error(f"获取对话摘要失败: {e}")
+            logger.error("获取对话摘要失败: %s", e)
             return {}
     
     def get_intent_examples(self) -> Dict[str, List[str]]:
@@ -222,7 +222,7 @@ class ChatAssistant:
             }
             
         except Exception as e:
-            logger.error(f"获取系统状态失败: {e}")
+            logger.error("获取系统状态失败: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -238,7 +238,7 @@ class ChatAssistant:
         try:
             return self.conversation_manager.export_conversation(session_id)
         except Exception as e:
-            logger.error(f"导出对话失败: {e}")
+            logger.error("导出对话失败: %s", e)
             return None
     
     def import_conversation(self, data: Dict[str, Any]) -> bool:
@@ -246,7 +246,7 @@ class ChatAssistant:
         try:
             return self.conversation_manager.import_conversation(data)
         except Exception as e:
-            logger.error(f"导入对话失败: {e}")
+            logger.error("导入对话失败: %s", e)
             return False
     
     def batch_process_messages(self, messages: List[Dict[str, str]], 
@@ -300,7 +300,7 @@ class ChatAssistant:
             }
             
         except Exception as e:
-            logger.error(f"获取对话统计信息失败: {e}")
+            logger.error("获取对话统计信息失败: %s", e)
             return {
                 'error': str(e),
                 'timestamp': datetime.now().isoformat()
@@ -335,5 +335,5 @@ class ChatAssistant:
             return suggestions[0] if suggestions else None
             
         except Exception as e:
-            logger.error(f"生成建议失败: {e}")
+            logger.error("生成建议失败: %s", e)
             return None 
\ No newline at end of file
@@ -10,20 +10,23 @@ Command Executor Module
 
 import os
 import sys
+import time
 import logging
 import concurrent.futures
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
+from functools import cached_property
 from datetime import datetime
 
 import google.generativeai as genai
 
 # 添加项目根目录到路径
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
 
 from src.workflow.executor import WorkflowExecutor
 from src.chat_assistant.intent_recognizer import Intent, IntentType
-from src.functional_testing.test_manager import FunctionalTestManager
 
 logger = logging.getLogger(__name__)
 
@@ -58,13 +61,6 @@ class CommandExecutor:
         self.workflow_executor = None
         self._init_workflow_executor()
         
-        # 初始化Gemini模型
-        self.gemini_model = None
-        self._init_gemini_model()
-        
-        # 初始化功能测试管理器
-        self.functional_test_manager = FunctionalTestManager()
-        
         # 默认配置
         self.default_config = {
             'app_token': os.getenv('FEISHU_APP_TOKEN'),
@@ -79,16 +75,27 @@ class CommandExecutor:
             self.workflow_executor = WorkflowExecutor()
             logger.info("工作流执行器初始化成功")
         except Exception as e:
-            logger.error(f"工作流执行器初始化失败: {e}")
+            logger.error("工作流执行器初始化失败: %s", e)
             self.workflow_executor = None
     
+    @cached_property
+    def functional_test_manager(self):
+        """功能测试管理器 (仅执行功能测试时才加载)"""
+        from src.functional_testing.test_manager import FunctionalTestManager
+        return FunctionalTestManager()
+    
+    @cached_property
+    def gemini_model(self):
+        """Gemini模型 (仅处理未知意图时才初始化)"""
+        return self._init_gemini_model()
+    
     def _init_gemini_model(self):
-        """初始化Gemini模型"""
+        """初始化Gemini模型，失败时返回None"""
         try:
             api_key = os.getenv("GEMINI_API_KEY")
             if not api_key:
                 logger.warning("GEMINI_API_KEY未配置，未知意图将无法使用AI对话功能")
-                return
+                return None
             
             genai.configure(api_key=api_key)
             
@@ -102,18 +109,17 @@ class CommandExecutor:
             
             for model_name in model_names:
                 try:
-                    self.gemini_model = genai.GenerativeModel(model_name)
-                    logger.info(f"Gemini模型初始化成功: {model_name}")
-                    break
+                    model = genai.GenerativeModel(model_name)
+                    logger.info("Gemini模型初始化成功: %s", model_name)
+                    return model
                 except Exception as e:
-                    logger.warning(f"模型 {model_name} 初始化失败: {e}")
+                    logger.warning("模型 %s 初始化失败: %s", model_name, e)
                     continue
             
-            if not self.gemini_model:
-                logger.error("无法初始化任何Gemini模型")
+            logger.error("无法初始化任何Gemini模型")
         except Exception as e:
-            logger.error(f"Gemini模型初始化失败: {e}")
-            self.gemini_model = None
+            logger.error("Gemini模型初始化失败: %s", e)
+        return None
     
     def _get_base_url(self) -> str:
         """获取基础URL，根据环境自动判断"""
@@ -190,7 +196,7 @@ class CommandExecutor:
     
     def execute_intent(self, intent: Intent, context: Optional[Dict[str, Any]] = None) -> ExecutionResult:
         """执行意图"""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         try:
             # 根据意图类型选择执行方法
@@ -216,19 +222,18 @@ class CommandExecutor:
                 result = self._execute_unknown_intent(intent, context)
             
             # 计算执行时间
-            end_time = datetime.now()
-            result.execution_time = (end_time - start_time).total_seconds()
+            result.execution_time = time.perf_counter() - start_time
+            logger.info("意图执行完成: %s, 耗时 %.3f 秒", intent.type.value, result.execution_time)
             
             return result
             
         except Exception as e:
-            logger.error(f"执行意图时发生错误: {e}")
-            end_time = datetime.now()
+            logger.error("执行意图时发生错误: %s", e)
             return ExecutionResult(
                 success=False,
                 message=f"执行失败: {str(e)}",
                 error=str(e),
-                execution_time=(end_time - start_time).total_seconds()
+                execution_time=time.perf_counter() - start_time
             )
     
     def _execute_generate_test_cases(self, intent: Intent, context: Optional[Dict[str, Any]]) -> ExecutionResult:
@@ -423,7 +428,7 @@ class CommandExecutor:
                 )
                 
         except Exception as e:
-            logger.error(f"功能测试执行失败: {e}")
+            logger.error("功能测试执行失败: %s", e)
             return ExecutionResult(
                 success=False,
                 message=f"功能测试执行失败: {str(e)}",
@@ -671,7 +676,7 @@ class CommandExecutor:
             return reports[:limit]
             
         except Exception as e:
-            logger.error(f"获取报告列表失败: {e}")
+            logger.error("获取报告列表失败: %s", e)
             return []
     
     def _get_project_list(self) -> List[Dict[str, Any]]:
@@ -730,7 +735,7 @@ class CommandExecutor:
 """
             
             # 调用Gemini API
-            logger.info(f"使用Gemini处理未知意图: {intent.raw_text}")
+            logger.info("使用Gemini处理未知意图: %s", intent.raw_text)
             
             with concurrent.futures.ThreadPoolExecutor() as executor:
                 future = executor.submit(self._call_gemini_api, prompt)
@@ -754,7 +759,7 @@ class CommandExecutor:
                     )
         
         except Exception as e:
-            logger.error(f"Gemini对话失败: {e}")
+            logger.error("Gemini对话失败: %s", e)
             return ExecutionResult(
                 success=False,
                 message="抱歉，AI对话功能暂时不可用。请尝试使用更具体的描述，或者输入'帮助'查看可用功能。",
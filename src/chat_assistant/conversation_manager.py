@@ -8,7 +8,6 @@ Conversation Manager Module
 管理用户对话上下文和历史记录
 """
 
-import json
 import logging
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
@@ -87,7 +86,7 @@ class ConversationManager:
         
         self.add_message(session_id, welcome_message)
         
-        logger.info(f"新对话开始: session_id={session_id}, user_id={user_id}")
+        logger.info("新对话开始: session_id=%s, user_id=%s", session_id, user_id)
         return context
     
     def add_message(self, session_id: str, message: Message) -> None:
@@ -230,7 +229,7 @@ class ConversationManager:
         # 存储提取的参数
         if extracted_params:
             self.update_context(session_id, {'parameters': extracted_params})
-            logger.info(f"从消息中提取参数: {extracted_params}")
+            logger.info("从消息中提取参数: %s", extracted_params)
     
     def _is_context_valid(self, context: ConversationContext) -> bool:
         """检查上下文是否有效（未超时）"""
@@ -254,7 +253,7 @@ class ConversationManager:
             if session_id in self.conversations:
                 del self.conversations[session_id]
         
-        logger.info(f"清理了 {len(expired_sessions)} 个过期的对话上下文")
+        logger.info("清理了 %s 个过期的对话上下文", len(expired_sessions))
         return len(expired_sessions)
     
     def get_conversation_summary(self, session_id: str) -> Dict[str, Any]:
@@ -319,9 +318,9 @@ class ConversationManager:
             
             self.conversations[session_id] = messages
             
-            logger.info(f"成功导入对话记录: session_id={session_id}")
+            logger.info("成功导入对话记录: session_id=%s", session_id)
             return True
             
         except Exception as e:
-            logger.error(f"导入对话记录失败: {e}")
+            logger.error("导入对话记录失败: %s", e)
             return False 
\ No newline at end of file
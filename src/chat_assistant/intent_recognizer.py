@@ -16,6 +16,29 @@ from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# 预编译的固定正则，避免每次识别时重复查找/编译
+_CHINESE_TAIL_RE = re.compile(r'[\u4e00-\u9fff].*$')
+_URL_WITH_XPATH_RE = re.compile(
+    r'(https?://[^\s\u4e00-\u9fff]+)[\u4e00-\u9fff]*.*?(/html/body[^\s\u4e00-\u9fff]*)',
+    re.IGNORECASE
+)
+_XPATH_RES = (
+    re.compile(r'(/html/body[^\s\u4e00-\u9fff]*)'),  # 匹配以/html/body开头的XPath，排除中文字符
+    re.compile(r'(//[a-zA-Z]+[^\s\u4e00-\u9fff]*)'),  # 匹配以//开头的XPath，排除中文字符
+)
+_DEVICE_RES = (
+    ('mobile', re.compile(r'移动端|手机|mobile', re.IGNORECASE)),
+    ('desktop', re.compile(r'桌面端|电脑|desktop', re.IGNORECASE)),
+    ('tablet', re.compile(r'平板|tablet', re.IGNORECASE)),
+)
+# 判断冒号后内容是否像XPath的特征片段
+_XPATH_TAG_HINTS = ('html', 'body', 'div', 'span', 'p', '[', ']')
+_PROJECT_NAME_RES = (
+    re.compile(r'项目[：:]\s*([^\s]+)', re.IGNORECASE),
+    re.compile(r'project[：:]\s*([^\s]+)', re.IGNORECASE),
+    re.compile(r'名称[：:]\s*([^\s]+)', re.IGNORECASE),
+)
+
 class IntentType(Enum):
     """意图类型枚举"""
     # 测试相关
@@ -59,6 +82,15 @@ class IntentRecognizer:
     def __init__(self):
         self.intent_patterns = self._init_intent_patterns()
         self.parameter_extractors = self._init_parameter_extractors()
+        # 模式在初始化时编译一次，识别时直接复用
+        self._compiled_intent_patterns = {
+            intent_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for intent_type, patterns in self.intent_patterns.items()
+        }
+        self._compiled_extractors = {
+            name: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for name, patterns in self.parameter_extractors.items()
+        }
     
     def _init_intent_patterns(self) -> Dict[IntentType, List[str]]:
         """初始化意图匹配模式"""
@@ -259,7 +291,7 @@ class IntentRecognizer:
         best_match = None
         best_confidence = 0.0
         
-        for intent_type, patterns in self.intent_patterns.items():
+        for intent_type, patterns in self._compiled_intent_patterns.items():
             confidence = self._calculate_confidence(normalized_text, patterns)
             if confidence > best_confidence:
                 best_confidence = confidence
@@ -280,20 +312,21 @@ class IntentRecognizer:
             raw_text=original_text
         )
     
-    def _calculate_confidence(self, text: str, patterns: List[str]) -> float:
+    def _calculate_confidence(self, text: str, patterns: List[re.Pattern]) -> float:
         """计算匹配置信度"""
         if not patterns:
             return 0.0
             
         max_match_score = 0.0
         
-        for pattern in patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+        for compiled in patterns:
+            if compiled.search(text):
+                pattern = compiled.pattern
                 # 计算模式匹配分数
                 pattern_score = 0.5  # 基础匹配分数
                 
                 # 完全匹配加分
-                if re.fullmatch(pattern, text, re.IGNORECASE):
+                if compiled.fullmatch(text):
                     pattern_score = 1.0
                 elif text.strip() == pattern.strip():
                     pattern_score = 1.0
@@ -363,18 +396,13 @@ class IntentRecognizer:
         
         # 额外的XPath提取（从文本中直接提取XPath模式）
         if not parameters.get('xpath_selector'):
-            xpath_patterns = [
-                r'(/html/body[^\s\u4e00-\u9fff]*)',  # 匹配以/html/body开头的XPath，排除中文字符
-                r'(//[a-zA-Z]+[^\s\u4e00-\u9fff]*)',  # 匹配以//开头的XPath，排除中文字符
-            ]
-            
-            for pattern in xpath_patterns:
-                matches = re.findall(pattern, text)
+            for xpath_re in _XPATH_RES:
+                matches = xpath_re.findall(text)
                 if matches:
                     # 进一步清理XPath，确保只包含有效字符
                     xpath = matches[0]
                     # 移除XPath中的中文字符和其后的内容
-                    cleaned_xpath = re.sub(r'[\u4e00-\u9fff].*$', '', xpath)
+                    cleaned_xpath = _CHINESE_TAIL_RE.sub('', xpath)
                     if cleaned_xpath and cleaned_xpath != xpath:
                         parameters['xpath_selector'] = cleaned_xpath
                         break
@@ -417,23 +445,22 @@ class IntentRecognizer:
         # 这种格式需要特殊处理来分离URL和XPath
         
         # 匹配URL后面跟着中文的情况
-        url_with_chinese_pattern = r'(https?://[^\s\u4e00-\u9fff]+)[\u4e00-\u9fff]*.*?(/html/body[^\s\u4e00-\u9fff]*)'
-        matches = re.findall(url_with_chinese_pattern, text, re.IGNORECASE)
+        matches = _URL_WITH_XPATH_RE.findall(text)
         for match in matches:
             url_part = match[0]
             xpath_part = match[1] if match[1] else None
             urls.append(url_part)
             if xpath_part:
                 # 清理XPath，确保不包含中文字符
-                cleaned_xpath = re.sub(r'[\u4e00-\u9fff].*$', '', xpath_part)
+                cleaned_xpath = _CHINESE_TAIL_RE.sub('', xpath_part)
                 self._extracted_xpath = cleaned_xpath if cleaned_xpath else xpath_part
         
         # 然后使用原有的URL提取逻辑
-        for pattern in self.parameter_extractors['url']:
-            pattern_matches = re.findall(pattern, text, re.IGNORECASE)
+        for url_re in self._compiled_extractors['url']:
+            pattern_matches = url_re.findall(text)
             for match in pattern_matches:
                 # 清理URL，去掉中文字符后的部分
-                cleaned_url = re.sub(r'[\u4e00-\u9fff].*$', '', match)
+                cleaned_url = _CHINESE_TAIL_RE.sub('', match)
                 if cleaned_url and cleaned_url != match:
                     urls.append(cleaned_url)
                 else:
@@ -444,11 +471,11 @@ class IntentRecognizer:
     def _extract_document_tokens(self, text: str) -> List[str]:
         """提取文档token"""
         tokens = []
-        for pattern in self.parameter_extractors['document_token']:
+        for token_re in self._compiled_extractors['document_token']:
             # 检查是否包含捕获组
-            if '(' in pattern and ')' in pattern:
+            if token_re.groups:
                 # 包含捕获组，使用findall获取捕获的内容
-                matches = re.findall(pattern, text, re.IGNORECASE)
+                matches = token_re.findall(text)
                 if matches:
                     # 处理可能的元组结果（多个捕获组）
                     for match in matches:
@@ -458,7 +485,7 @@ class IntentRecognizer:
                             tokens.append(match)
             else:
                 # 不包含捕获组，使用findall获取完整匹配
-                matches = re.findall(pattern, text, re.IGNORECASE)
+                matches = token_re.findall(text)
                 tokens.extend(matches)
         
         # 过滤掉过短的token和重复的token
@@ -467,28 +494,16 @@ class IntentRecognizer:
     
     def _extract_device_type(self, text: str) -> Optional[str]:
         """提取设备类型"""
-        device_patterns = {
-            'mobile': r'移动端|手机|mobile',
-            'desktop': r'桌面端|电脑|desktop',
-            'tablet': r'平板|tablet'
-        }
-        
-        for device, pattern in device_patterns.items():
-            if re.search(pattern, text, re.IGNORECASE):
+        for device, device_re in _DEVICE_RES:
+            if device_re.search(text):
                 return device
         
         return None
     
     def _extract_project_name(self, text: str) -> Optional[str]:
         """提取项目名称"""
-        patterns = [
-            r'项目[：:]\s*([^\s]+)',
-            r'project[：:]\s*([^\s]+)',
-            r'名称[：:]\s*([^\s]+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for project_re in _PROJECT_NAME_RES:
+            match = project_re.search(text)
             if match:
                 return match.group(1)
         
@@ -496,16 +511,16 @@ class IntentRecognizer:
     
     def _extract_cookies(self, text: str) -> Optional[str]:
         """提取cookie字符串"""
-        for pattern in self.parameter_extractors['cookie']:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for cookie_re in self._compiled_extractors['cookie']:
+            match = cookie_re.search(text)
             if match:
                 return match.group(1).strip()
         return None
     
     def _extract_localstorage(self, text: str) -> Optional[Dict[str, Any]]:
         """提取localStorage对象"""
-        for pattern in self.parameter_extractors['localstorage']:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for storage_re in self._compiled_extractors['localstorage']:
+            match = storage_re.search(text)
             if match:
                 try:
                     # 尝试解析JSON格式的localStorage
@@ -560,7 +575,7 @@ class IntentRecognizer:
                 xpath_part = remaining[pos + 1:]
                 
                 # 检查冒号后面是否看起来像XPath
-                if xpath_part.startswith('/') or any(tag in xpath_part.lower() for tag in ['html', 'body', 'div', 'span', 'p', '[', ']']):
+                if xpath_part.startswith('/') or any(tag in xpath_part.lower() for tag in _XPATH_TAG_HINTS):
                     # 进一步验证：XPath应该不是纯数字（排除端口号）
                     if not xpath_part.replace('/', '').replace('[', '').replace(']', '').isdigit():
                         actual_colon_pos = protocol_end + pos
@@ -579,7 +594,7 @@ class IntentRecognizer:
                     xpath_part = ':'.join(parts[i:])
                     
                     # 检查是否为有效的XPath
-                    if xpath_part.startswith('/') or any(tag in xpath_part.lower() for tag in ['html', 'body', 'div', 'span', 'p', '[', ']']):
+                    if xpath_part.startswith('/') or any(tag in xpath_part.lower() for tag in _XPATH_TAG_HINTS):
                         if not xpath_part.replace('/', '').replace('[', '').replace(']', '').isdigit():
                             return url_part, xpath_part
                 
@@ -17,6 +17,12 @@ from datetime import datetime
 from src.chat_assistant.command_executor import ExecutionResult
 from src.chat_assistant.intent_recognizer import IntentType
 
+try:
+    import orjson
+except ImportError:
+    # orjson为可选依赖，不可用时回退到标准库json
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 class ResponseFormatter:
@@ -56,7 +62,7 @@ class ResponseFormatter:
             else:
                 return self._format_error_response(result, intent_type, context)
         except Exception as e:
-            logger.error(f"格式化响应失败: {e}")
+            logger.error("格式化响应失败: %s", e)
             return f"{self.emoji_map['error']} 响应格式化失败: {str(e)}"
     
     def _format_success_response(self, result: ExecutionResult, intent_type: IntentType, 
@@ -319,6 +325,9 @@ class ResponseFormatter:
             # 读取最新的报告文件
             latest_report = max(report_files, key=os.path.getmtime)
             
+            if orjson is not None:
+                with open(latest_report, 'rb') as f:
+                    return orjson.loads(f.read())
             with open(latest_report, 'r', encoding='utf-8') as f:
                 return json.load(f)
                 
@@ -333,7 +342,7 @@ class ResponseFormatter:
             return None
             
         if not os.path.exists(file_path):
-            logger.warning(f"文件不存在: {file_path}")
+            logger.warning("文件不存在: %s", file_path)
             return None
         
         try:
@@ -351,11 +360,11 @@ class ResponseFormatter:
             # 构建最终URL
             final_url = f"{base_url}/files/{url_path}"
             
-            logger.info(f"URL转换: {file_path} -> {final_url}")
+            logger.info("URL转换: %s -> %s", file_path, final_url)
             return final_url
             
         except Exception as e:
-            logger.error(f"路径转换失败: {file_path} - {e}")
+            logger.error("路径转换失败: %s - %s", file_path, e)
             return None
     
     def _get_fallback_base_url(self) -> str:
@@ -3,14 +3,89 @@
 Feishu API Client
 """
 import requests
-import json
+import re
 from typing import Dict, List, Optional, Any
 from ..utils.logger import get_logger
 from ..utils.config import Config
+from ..utils.http_session import http_session, parse_json, dump_json
 import time
+from functools import lru_cache
 
 logger = get_logger(__name__)
 
+# 租户访问令牌缓存 app_id -> (token, 过期时间)，多个客户端实例共享，令牌有效期内不重复请求
+_TENANT_TOKEN_CACHE: Dict[str, tuple] = {}
+
+# 提前刷新的余量（秒），避免令牌在请求途中过期
+TOKEN_REFRESH_MARGIN = 300
+
+# 文档链接中的token模式，按优先级依次尝试
+# 支持的格式:
+# https://company.feishu.cn/docx/token
+# https://company.feishu.cn/docs/token
+# https://company.feishu.cn/document/token
+_DOC_TOKEN_RES = (
+    re.compile(r'/docx/([a-zA-Z0-9]+)'),
+    re.compile(r'/docs/([a-zA-Z0-9]+)'),
+    re.compile(r'/document/([a-zA-Z0-9]+)'),
+)
+_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9]')
+_ALNUM_TOKEN_RE = re.compile(r'[a-zA-Z0-9]+')
+
+@lru_cache(maxsize=128)
+def _extract_token_from_string(document_input: str) -> str:
+    """
+    从链接或token字符串中提取文档token（结果按输入缓存，同一链接不重复解析）
+    Extract a document token from a URL or token string, memoized per input
+    """
+    # 首先尝试从URL中提取token
+    for token_re in _DOC_TOKEN_RES:
+        match = token_re.search(document_input)
+        if match:
+            token = match.group(1)
+            if _is_valid_token(token):
+                logger.info(f"从链接中提取到文档token: {token}")
+                return token
+    
+    # 如果不是URL格式，检查是否是有效的token
+    if _is_valid_token(document_input):
+        logger.info(f"使用直接token: {document_input}")
+        return document_input
+    
+    # 最后尝试清理输入（移除特殊字符）
+    cleaned_token = _NON_ALNUM_RE.sub('', document_input)
+    if _is_valid_token(cleaned_token):
+        logger.warning(f"使用清理后的token: {cleaned_token}")
+        return cleaned_token
+    
+    # 提供详细的错误信息
+    if len(document_input) < 3:
+        raise ValueError(f"输入'{document_input}'太短，无法识别为有效的文档token或链接。")
+    else:
+        raise ValueError(f"无法从输入'{document_input}'中提取有效的文档token。请提供：\n1. 完整飞书文档链接 (如: https://company.feishu.cn/docx/token)\n2. 直接的文档token (如: ZzVudkYQqobhj7xn19GcZ3LFnwd)")
+
+def _is_valid_token(token: str) -> bool:
+    """验证文档token是否有效，规则见 FeishuClient._is_valid_document_token"""
+    if not token:
+        return False
+    
+    # 飞书文档token通常特征：
+    # 1. 长度通常在15-30个字符之间
+    # 2. 只包含字母和数字
+    # 3. 通常包含大小写字母
+    if len(token) < 15 or len(token) > 50:
+        return False
+    
+    if not _ALNUM_TOKEN_RE.fullmatch(token):
+        return False
+    
+    # 确保包含至少一些大写和小写字母（飞书token的典型特征）
+    has_upper = any(c.isupper() for c in token)
+    has_lower = any(c.islower() for c in token)
+    has_digit = any(c.isdigit() for c in token)
+    
+    return has_upper and has_lower and has_digit
+
 class FeishuClient:
     """飞书API客户端 Feishu API Client"""
     
@@ -31,7 +106,9 @@ class FeishuClient:
         Returns:
             访问令牌 access token
         """
-        if self.access_token:
+        cached = _TENANT_TOKEN_CACHE.get(self.config['app_id'])
+        if cached and time.monotonic() < cached[1]:
+            self.access_token = cached[0]
             return self.access_token
             
         url = f"{self.base_url}/auth/v3/tenant_access_token/internal"
@@ -47,7 +124,7 @@ class FeishuClient:
             try:
                 logger.info(f"获取飞书访问令牌 (尝试 {attempt + 1}/{max_retries})")
                 
-                response = requests.post(
+                response = http_session.post(
                     url, 
                     json=data, 
                     timeout=10,  # 添加超时
@@ -57,10 +134,13 @@ class FeishuClient:
                     }
                 )
                 response.raise_for_status()
-                result = response.json()
+                result = parse_json(response)
                 
                 if result.get('code') == 0:
                     self.access_token = result['tenant_access_token']
+                    # 飞书返回的expire为剩余有效秒数（通常为7200）
+                    expires_at = time.monotonic() + max(result.get('expire', 7200) - TOKEN_REFRESH_MARGIN, 0)
+                    _TENANT_TOKEN_CACHE[self.config['app_id']] = (self.access_token, expires_at)
                     logger.info("成功获取飞书访问令牌 / Successfully obtained Feishu access token")
                     return self.access_token
                 else:
@@ -117,9 +197,9 @@ class FeishuClient:
             try:
                 logger.info(f"获取文档内容 (尝试 {attempt + 1}/{max_retries}): {document_token}")
                 
-                response = requests.get(url, headers=headers, timeout=15)
+                response = http_session.get(url, headers=headers, timeout=15)
                 response.raise_for_status()
-                result = response.json()
+                result = parse_json(response)
                 
                 if result.get('code') == 0:
                     logger.info(f"成功获取文档内容: {document_token}")
@@ -171,9 +251,9 @@ class FeishuClient:
         }
         
         try:
-            response = requests.get(url, headers=headers)
+            response = http_session.get(url, headers=headers)
             response.raise_for_status()
-            result = response.json()
+            result = parse_json(response)
             
             if result.get('code') == 0:
                 logger.info(f"成功获取文档块: {document_token}")
@@ -336,8 +416,6 @@ class FeishuClient:
         Returns:
             提取的文档token (extracted document token)
         """
-        import re
-        
         # 处理超链接对象格式（飞书多维表格超链接字段）
         if isinstance(document_input, dict):
             # 超链接对象格式：{"text": "AI 日历", "link": "https://..."}
@@ -353,43 +431,7 @@ class FeishuClient:
         if not document_input or not str(document_input).strip():
             raise ValueError("文档输入不能为空")
         
-        document_input = str(document_input).strip()
-        
-        # 首先尝试从URL中提取token
-        # 支持的格式:
-        # https://company.feishu.cn/docx/token
-        # https://company.feishu.cn/docs/token
-        # https://company.feishu.cn/document/token
-        token_patterns = [
-            r'/docx/([a-zA-Z0-9]+)',
-            r'/docs/([a-zA-Z0-9]+)', 
-            r'/document/([a-zA-Z0-9]+)'
-        ]
-        
-        for pattern in token_patterns:
-            match = re.search(pattern, document_input)
-            if match:
-                token = match.group(1)
-                if self._is_valid_document_token(token):
-                    logger.info(f"从链接中提取到文档token: {token}")
-                    return token
-        
-        # 如果不是URL格式，检查是否是有效的token
-        if self._is_valid_document_token(document_input):
-            logger.info(f"使用直接token: {document_input}")
-            return document_input
-        
-        # 最后尝试清理输入（移除特殊字符）
-        cleaned_token = re.sub(r'[^a-zA-Z0-9]', '', document_input)
-        if self._is_valid_document_token(cleaned_token):
-            logger.warning(f"使用清理后的token: {cleaned_token}")
-            return cleaned_token
-        
-        # 提供详细的错误信息
-        if len(document_input) < 3:
-            raise ValueError(f"输入'{document_input}'太短，无法识别为有效的文档token或链接。")
-        else:
-            raise ValueError(f"无法从输入'{document_input}'中提取有效的文档token。请提供：\n1. 完整飞书文档链接 (如: https://company.feishu.cn/docx/token)\n2. 直接的文档token (如: ZzVudkYQqobhj7xn19GcZ3LFnwd)")
+        return _extract_token_from_string(str(document_input).strip())
 
     def _is_valid_document_token(self, token: str) -> bool:
         """
@@ -402,27 +444,7 @@ class FeishuClient:
         Returns:
             是否有效
         """
-        import re
-        
-        if not token:
-            return False
-        
-        # 飞书文档token通常特征：
-        # 1. 长度通常在15-30个字符之间
-        # 2. 只包含字母和数字
-        # 3. 通常包含大小写字母
-        if len(token) < 15 or len(token) > 50:
-            return False
-        
-        if not re.match(r'^[a-zA-Z0-9]+$', token):
-            return False
-        
-        # 确保包含至少一些大写和小写字母（飞书token的典型特征）
-        has_upper = any(c.isupper() for c in token)
-        has_lower = any(c.islower() for c in token)
-        has_digit = any(c.isdigit() for c in token)
-        
-        return has_upper and has_lower and has_digit
+        return _is_valid_token(token)
 
 
 
@@ -546,9 +568,9 @@ class FeishuClient:
         }
         
         try:
-            response = requests.get(url, headers=headers)
+            response = http_session.get(url, headers=headers)
             response.raise_for_status()
-            result = response.json()
+            result = parse_json(response)
             
             if result.get('code') == 0:
                 logger.info(f"成功获取多维表格信息: {app_token}")
@@ -580,9 +602,9 @@ class FeishuClient:
         }
         
         try:
-            response = requests.get(url, headers=headers)
+            response = http_session.get(url, headers=headers)
             response.raise_for_status()
-            result = response.json()
+            result = parse_json(response)
             
             if result.get('code') == 0:
                 logger.info(f"成功获取数据表列表: {app_token}")
@@ -615,9 +637,9 @@ class FeishuClient:
         }
         
         try:
-            response = requests.get(url, headers=headers)
+            response = http_session.get(url, headers=headers)
             response.raise_for_status()
-            result = response.json()
+            result = parse_json(response)
             
             if result.get('code') == 0:
                 logger.info(f"成功获取字段列表: {table_id}")
@@ -655,9 +677,9 @@ class FeishuClient:
         }
         
         try:
-            response = requests.post(url, headers=headers, json=data)
+            response = http_session.post(url, headers=headers, data=dump_json(data))
             response.raise_for_status()
-            result = response.json()
+            result = parse_json(response)
             
             if result.get('code') == 0:
                 logger.info(f"成功创建记录: {table_id}")
@@ -696,9 +718,9 @@ class FeishuClient:
         }
         
         try:
-            response = requests.put(url, headers=headers, json=data)
+            response = http_session.put(url, headers=headers, data=dump_json(data))
             response.raise_for_status()
-            result = response.json()
+            result = parse_json(response)
             
             if result.get('code') == 0:
                 logger.info(f"成功更新记录: {record_id}")
@@ -758,9 +780,9 @@ class FeishuClient:
             params["page_token"] = page_token
         
         try:
-            response = requests.get(url, headers=headers, params=params)
+            response = http_session.get(url, headers=headers, params=params)
             response.raise_for_status()
-            result = response.json()
+            result = parse_json(response)
             
             if result.get('code') == 0:
                 logger.info(f"成功获取记录: {table_id}")
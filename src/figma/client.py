@@ -3,14 +3,14 @@ Figma API客户端
 Figma API Client
 """
 import os
-import requests
-import json
+import shutil
 from typing import Dict, List, Any, Optional
 from urllib.parse import urlparse, parse_qs
 import time
 
 from ..utils.logger import get_logger
 from ..utils.config import Config
+from ..utils.http_session import http_session, parse_json
 
 logger = get_logger(__name__)
 
@@ -120,10 +120,10 @@ class FigmaClient:
         """
         try:
             url = f"{self.base_url}/files/{file_id}"
-            response = requests.get(url, headers=self.headers)
+            response = http_session.get(url, headers=self.headers)
             response.raise_for_status()
             
-            result = response.json()
+            result = parse_json(response)
             logger.info(f"成功获取Figma文件信息: {file_id}")
             return result
             
@@ -148,10 +148,10 @@ class FigmaClient:
             url = f"{self.base_url}/files/{file_id}/nodes"
             params = {"ids": node_ids_str}
             
-            response = requests.get(url, headers=self.headers, params=params)
+            response = http_session.get(url, headers=self.headers, params=params)
             response.raise_for_status()
             
-            result = response.json()
+            result = parse_json(response)
             logger.info(f"成功获取节点信息: {node_ids}")
             return result
             
@@ -183,10 +183,10 @@ class FigmaClient:
                 "scale": scale
             }
             
-            response = requests.get(url, headers=self.headers, params=params)
+            response = http_session.get(url, headers=self.headers, params=params)
             response.raise_for_status()
             
-            result = response.json()
+            result = parse_json(response)
             
             if result.get('err'):
                 raise Exception(f"Figma API error: {result.get('err')}")
@@ -212,14 +212,15 @@ class FigmaClient:
             保存的文件路径
         """
         try:
-            response = requests.get(image_url)
-            response.raise_for_status()
-            
             # 确保目录存在
             os.makedirs(os.path.dirname(save_path), exist_ok=True)
             
-            with open(save_path, 'wb') as f:
-                f.write(response.content)
+            # 流式写入磁盘，避免将高分辨率图片完整读入内存
+            with http_session.get(image_url, stream=True, timeout=30) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with open(save_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
             
             logger.info(f"图片下载成功: {save_path}")
             return save_path
@@ -6,12 +6,10 @@ Test Report Generator
 """
 
 import os
-import json
 import glob
 import shutil
 from typing import Dict, List, Any
 from datetime import datetime
-from pathlib import Path
 
 from ..utils.logger import get_logger
 from ..utils.asset_url_converter import convert_to_web_url, convert_screenshot_path, ensure_file_exists
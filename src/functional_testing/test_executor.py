@@ -6,9 +6,7 @@ Test Executor
 """
 
 import time
-import json
 import os
-import tempfile
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from selenium.webdriver.common.by import By
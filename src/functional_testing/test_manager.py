@@ -6,7 +6,6 @@ Functional Test Manager
 """
 
 import os
-import json
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
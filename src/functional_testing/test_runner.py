@@ -5,8 +5,6 @@ Test Runner
 协调测试执行和报告生成
 """
 
-import os
-import json
 from typing import List, Dict, Any
 from datetime import datetime
 
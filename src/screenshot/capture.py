@@ -4,10 +4,8 @@ Website Screenshot Capture Module
 """
 import os
 import time
-import signal
 import psutil
 import tempfile
-import uuid
 from typing import Dict, List, Optional, Tuple
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
@@ -259,7 +257,7 @@ class ScreenshotCapture:
     def _wait_for_page_fully_loaded(self, max_wait_time: int = 30):
         """等待页面完全加载，包括CSS和JavaScript，增加超时控制"""
         try:
-            start_time = time.time()
+            start_time = time.monotonic()
             
             # 基础页面加载检查（带超时）
             WebDriverWait(self.driver, min(max_wait_time, 15)).until(
@@ -267,7 +265,7 @@ class ScreenshotCapture:
             )
             
             # 检查剩余时间
-            elapsed = time.time() - start_time
+            elapsed = time.monotonic() - start_time
             remaining_time = max_wait_time - elapsed
             
             if remaining_time <= 0:
@@ -324,6 +322,89 @@ class ScreenshotCapture:
             # 如果检测失败，等待一个较短的固定时间
             time.sleep(3)
 
+    # 注入页面的网络活动跟踪脚本: 统计进行中的fetch/XHR请求，并记录最近一次网络活动时间
+    _NETWORK_TRACKER_SCRIPT = """
+        if (!window.__autoTestNetTracker) {
+            var tracker = window.__autoTestNetTracker = {pending: 0, lastActivity: Date.now()};
+            var start = function() { tracker.pending++; tracker.lastActivity = Date.now(); };
+            var end = function() { tracker.pending = Math.max(0, tracker.pending - 1); tracker.lastActivity = Date.now(); };
+            // 默认缓冲区只保留250条资源记录，超出后不再产生新条目
+            try { performance.setResourceTimingBufferSize(10000); } catch (e) {}
+            if (window.fetch) {
+                var originalFetch = window.fetch;
+                window.fetch = function() {
+                    start();
+                    return originalFetch.apply(this, arguments).finally(end);
+                };
+            }
+            var originalSend = XMLHttpRequest.prototype.send;
+            XMLHttpRequest.prototype.send = function() {
+                start();
+                this.addEventListener('loadend', end);
+                return originalSend.apply(this, arguments);
+            };
+            // 资源(图片、脚本、样式等)加载完成时更新活动时间，不受缓冲区上限影响
+            if (window.PerformanceObserver) {
+                try {
+                    new PerformanceObserver(function() { tracker.lastActivity = Date.now(); })
+                        .observe({type: 'resource'});
+                } catch (e) {}
+            }
+        }
+    """
+
+    # 返回当前页面的加载状态: 文档状态、进行中的请求数、未加载完成的可见图片数及空闲时长
+    _NETWORK_STATE_SCRIPT = """
+        var tracker = window.__autoTestNetTracker || {pending: 0, lastActivity: 0};
+        var viewportBottom = window.innerHeight * 2;
+        var pendingImages = 0;
+        document.querySelectorAll('img').forEach(function(img) {
+            if (img.complete || !(img.currentSrc || img.src)) {
+                return;
+            }
+            // 视口外的懒加载图片在滚动前不会加载，不计入
+            if (img.loading === 'lazy' && img.getBoundingClientRect().top > viewportBottom) {
+                return;
+            }
+            pendingImages++;
+        });
+        return {
+            ready: document.readyState === 'complete',
+            pending: tracker.pending,
+            pendingImages: pendingImages,
+            idleMs: Date.now() - tracker.lastActivity
+        };
+    """
+
+    def _wait_for_network_idle(self, max_wait_time: float = 5, idle_time: float = 0.5):
+        """
+        等待网络空闲，最多等待max_wait_time秒
+        文档加载完成、没有进行中的fetch/XHR请求和未完成的图片，且idle_time内无新的网络活动时视为空闲；
+        页面加载快时可提前返回，替代固定时长的sleep
+        
+        注意: 跟踪脚本在页面打开后才注入，注入前已发出且仍未完成的fetch/XHR无法统计
+        """
+        if max_wait_time <= 0:
+            return
+        deadline = time.monotonic() + max_wait_time
+        try:
+            self.driver.execute_script(self._NETWORK_TRACKER_SCRIPT)
+            # 在Python侧轮询同步脚本，避免长等待触发Selenium异步脚本超时(默认30秒)
+            while True:
+                state = self.driver.execute_script(self._NETWORK_STATE_SCRIPT)
+                if (state['ready'] and state['pending'] == 0 and state['pendingImages'] == 0
+                        and state['idleMs'] >= idle_time * 1000):
+                    logger.debug("网络空闲等待结果: idle")
+                    return
+                if time.monotonic() >= deadline:
+                    logger.debug(f"网络空闲等待结果: timeout {state}")
+                    return
+                time.sleep(0.1)
+        except Exception as e:
+            logger.warning(f"等待网络空闲失败，回退到固定等待: {e}")
+            # 只补足剩余时间，不在已等待的基础上再等待完整时长
+            time.sleep(max(0, deadline - time.monotonic()))
+
     def _set_language(self):
         """设置浏览器语言偏好"""
         try:
@@ -487,8 +568,8 @@ class ScreenshotCapture:
             # 设置语言
             self._set_language()
 
-            # 等待页面加载
-            time.sleep(min(wait_time, 5))
+            # 等待页面加载（网络空闲即返回）
+            self._wait_for_network_idle(max_wait_time=min(wait_time, 5))
             self._wait_for_page_fully_loaded(max_wait_time=20)
 
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -848,7 +929,8 @@ class ScreenshotCapture:
             if self.driver:
                 self._set_enhanced_local_storage(local_storage, device, mobile_devices)
             
-            time.sleep(wait_time)
+            # 等待网络空闲（最多wait_time秒）
+            self._wait_for_network_idle(max_wait_time=wait_time)
             
             # 等待页面完全加载
             WebDriverWait(self.driver, 10).until(
@@ -1195,7 +1277,8 @@ class ScreenshotCapture:
             # 设置语言
             self._set_language()
             
-            time.sleep(wait_time)
+            # 等待网络空闲（最多wait_time秒）
+            self._wait_for_network_idle(max_wait_time=wait_time)
             
             # 等待页面完全加载
             WebDriverWait(self.driver, 10).until(
@@ -1298,7 +1381,8 @@ class ScreenshotCapture:
             # 设置语言
             self._set_language()
             
-            time.sleep(wait_time)
+            # 等待网络空闲（最多wait_time秒）
+            self._wait_for_network_idle(max_wait_time=wait_time)
             
             # 等待页面完全加载
             WebDriverWait(self.driver, 10).until(
@@ -0,0 +1,85 @@
+"""
+共享HTTP会话模块
+Shared HTTP session module
+"""
+import json
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    # orjson为可选依赖，不可用时回退到标准库json
+    orjson = None
+
+# 仅对幂等的GET/HEAD请求在网关错误(502/503/504)时重试。
+# 连接错误和读超时不在适配器层重试: 飞书客户端的令牌及文档请求已有针对这两类错误的带退避重试循环，
+# 叠加后单次超时会被放大数倍；而网关错误响应很快返回，且这些循环不会对HTTP错误状态重试，两者不会叠加
+_GATEWAY_RETRY = Retry(
+    total=3,
+    connect=0,
+    read=0,
+    status=3,
+    backoff_factor=0.3,
+    status_forcelist=[502, 503, 504],
+    allowed_methods=frozenset(['GET', 'HEAD']),
+    raise_on_status=False
+)
+
+def create_session(pool_connections: int = 10, pool_maxsize: int = 20) -> requests.Session:
+    """
+    创建带连接池及网关错误重试的HTTP会话
+    Create an HTTP session with connection pooling and gateway-error retries
+    
+    Args:
+        pool_connections: 缓存的连接池数量 number of host pools to cache
+        pool_maxsize: 每个连接池的最大连接数 max connections per pool
+        
+    Returns:
+        HTTP会话 HTTP session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=_GATEWAY_RETRY
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+def parse_json(response: requests.Response):
+    """
+    解析JSON响应体，可用时使用orjson直接解析原始字节
+    Parse a JSON response body, using orjson on the raw bytes when available
+    
+    Args:
+        response: HTTP响应 HTTP response
+        
+    Returns:
+        解析后的JSON数据 decoded JSON data
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def dump_json(data) -> bytes:
+    """
+    将请求体序列化为UTF-8 JSON字节，中文不做\\u转义以减小请求体
+    Serialize a request body to UTF-8 JSON bytes without escaping non-ASCII text
+    
+    Args:
+        data: 待序列化的数据 data to serialize
+        
+    Returns:
+        JSON字节 JSON bytes
+    """
+    if orjson is not None:
+        # 相似度等评分可能是numpy标量
+        return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+# 全局共享会话，飞书与Figma客户端复用同一连接池以避免重复TLS握手
+http_session = create_session()
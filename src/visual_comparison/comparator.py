@@ -18,6 +18,12 @@ from datetime import datetime
 from ..utils.logger import get_logger
 from ..utils.asset_url_converter import convert_diff_image_path, ensure_file_exists
 
+try:
+    import orjson
+except ImportError:
+    # orjson为可选依赖，不可用时回退到标准库json
+    orjson = None
+
 logger = get_logger(__name__)
 
 @dataclass
@@ -28,7 +34,7 @@ class ComparisonResult:
     ssim_score: float       # 结构相似性指数
     hash_distance: int      # 感知哈希距离
     differences_count: int   # 差异点数量
-    diff_image_path: str    # 差异图像路径
+    diff_image_path: Optional[str]  # 差异图像路径 (无明显差异时可能为None)
     analysis: Dict          # 详细分析结果
 
 class VisualComparator:
@@ -81,7 +87,9 @@ class VisualComparator:
         return image
     
     def compare_images(self, image1_path: str, image2_path: str, 
-                      output_dir: str = "reports") -> ComparisonResult:
+                      output_dir: str = "reports",
+                      skip_diff_above: Optional[float] = None,
+                      report_path: Optional[str] = None) -> ComparisonResult:
         """
         比较两张图片的相似度
         
@@ -89,6 +97,8 @@ class VisualComparator:
             image1_path: 第一张图片路径（网页截图）
             image2_path: 第二张图片路径（Figma设计稿）
             output_dir: 输出目录
+            skip_diff_above: 相似度高于该值时跳过差异图生成（无明显差异）
+            report_path: 指定时在比较完成后直接写入JSON报告，无需再调用generate_report
             
         Returns:
             比对结果
@@ -149,12 +159,16 @@ class VisualComparator:
             
             self._log_memory_usage("相似度计算完成")
             
-            # 生成差异图像（使用优化版本）
-            diff_image_path = self._generate_diff_image_optimized(
-                img1_resized, img2_resized, output_dir
-            )
-            
-            self._log_memory_usage("差异图像生成完成")
+            # 生成差异图像（使用优化版本），无明显差异时跳过
+            if skip_diff_above is not None and similarity_score > skip_diff_above:
+                logger.info(f"相似度 {similarity_score:.3f} 高于 {skip_diff_above}，跳过差异图像生成")
+                diff_image_path = None
+            else:
+                diff_image_path = self._generate_diff_image_optimized(
+                    img1_resized, img2_resized, output_dir
+                )
+                
+                self._log_memory_usage("差异图像生成完成")
             
             # 分析差异
             analysis = self._analyze_differences(img1_resized, img2_resized)
@@ -177,6 +191,10 @@ class VisualComparator:
             
             logger.info(f"图片比较完成，相似度: {similarity_score:.3f}")
             self._log_memory_usage("比较完成")
+            
+            if report_path:
+                self.generate_report(result, report_path)
+            
             return result
             
         except Exception as e:
@@ -543,15 +561,24 @@ class VisualComparator:
                     'differences_count': int(result.differences_count),
                     'overall_rating': self._get_overall_rating(result.similarity_score)
                 },
-                'analysis': convert_numpy_types(result.analysis),
+                # orjson 原生支持numpy类型，无需预先转换
+                'analysis': result.analysis if orjson is not None else convert_numpy_types(result.analysis),
                 'diff_image_path': result.diff_image_path,
                 'recommendations': self._generate_recommendations(result)
             }
             
             # 保存JSON报告
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(report_data, f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                # 一次性序列化并写入
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(
+                        report_data,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+                    ))
+            else:
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(report_data, f, ensure_ascii=False, indent=2)
             
             logger.info(f"比对报告生成成功: {output_path}")
             return output_path
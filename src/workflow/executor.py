@@ -6,22 +6,31 @@ import os
 import time
 import json
 import sys
+import gc
 import signal
-import psutil
 import threading
 import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import cached_property, lru_cache
 from typing import Dict, List, Any, Optional
 from ..utils.logger import get_logger
 from ..feishu.client import FeishuClient
-from ..ai_analysis.gemini_case_generator import GeminiCaseGenerator
-from ..screenshot.capture import ScreenshotCapture
-from ..screenshot.figma_screenshot_service import FigmaScreenshotService, HybridScreenshotService
-from ..figma.client import FigmaClient
-from ..visual_comparison.comparator import VisualComparator
+
+try:
+    import orjson
+except ImportError:
+    # orjson为可选依赖，不可用时回退到标准库json
+    orjson = None
+
+# 项目代码所在目录 (不依赖启动时的工作目录)
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 # 导入环境配置
 try:
-    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+    # 规范化路径并仅在缺失时追加，避免重复导入时sys.path不断增长
+    if _PROJECT_ROOT not in sys.path:
+        sys.path.append(_PROJECT_ROOT)
     from config.environment import get_api_base_url
 except ImportError:
     # 如果环境配置不可用，则使用默认值
@@ -30,55 +39,241 @@ except ImportError:
 
 logger = get_logger(__name__)
 
+# 报告及多维表格中使用的时间格式
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# PRD测试用例缓存目录 (文档未变化时跳过Gemini调用)
+_PRD_CASE_CACHE_DIR = os.path.join(_PROJECT_ROOT, ".cache", "prd")
+
+# Figma设计稿跨请求缓存 (短时间内重复对比同一设计稿时跳过Figma下载)
+# 放在reports之外，避免被每次对比前的旧报告清理删除
+_FIGMA_DESIGN_CACHE_DIR = os.path.join(_PROJECT_ROOT, ".cache", "figma")
+FIGMA_DESIGN_CACHE_TTL = 300  # 秒，设计稿可能被修改，不宜长期缓存
+
+# Gemini调用失败时写入测试用例栏的报告模板
+_ERROR_REPORT_TEMPLATE = """# ⚠️ 测试用例生成失败
+
+## 错误信息
+**Gemini API调用失败**: {error_message}
+
+## 详细说明
+- **时间**: {failed_at}
+- **PRD文档**: {document_input}
+- **PRD文本长度**: {prd_text_length} 字符
+- **错误类型**: API服务不可用
+
+## 可能的原因
+1. **地理位置限制**: Gemini API在当前地区不可用
+2. **网络连接问题**: 无法连接到Google AI服务
+3. **API配置错误**: API密钥或配置有误
+4. **服务超时**: API响应时间过长
+
+## 建议解决方案
+1. **检查网络**: 确认网络连接正常
+2. **更换地区**: 尝试使用VPN或其他网络环境  
+3. **验证配置**: 检查GEMINI_API_KEY环境变量
+4. **稍后重试**: 等待服务恢复后重新执行
+
+## PRD文档内容预览
+```
+{prd_preview}
+```
+
+*注意: 可以手动基于上述PRD内容编写测试用例，或等待API服务恢复后重新执行工作流。*
+"""
+
 class TimeoutException(Exception):
     """超时异常"""
     pass
 
+def _shutdown_pool_nowait(pool: ThreadPoolExecutor):
+    """关闭线程池但不等待运行中的任务，并取消尚未开始的任务 (Python 3.8 不支持 cancel_futures)"""
+    try:
+        pool.shutdown(wait=False, cancel_futures=True)
+    except TypeError:
+        pool.shutdown(wait=False)
+
 class WorkflowTimeoutHandler:
-    """工作流超时处理器"""
+    """
+    工作流超时处理器
+    
+    主线程中使用 SIGALRM 直接中断阻塞的调用；在工作线程中（如Flask请求线程）无法投递信号，
+    改为在独立线程中执行工作流并限时等待结果，超时后向调用方抛出 TimeoutException。
+    超时的工作线程无法被强制终止，超时后调用 on_timeout（例如关闭浏览器驱动）使其阻塞调用尽快返回，
+    并可通过 timed_out 判断并放弃后续写入。
+    """
     
-    def __init__(self, timeout_seconds: int):
+    def __init__(self, timeout_seconds: int, on_timeout=None):
         self.timeout_seconds = timeout_seconds
-        self.timer = None
-        
-    def __enter__(self):
-        """进入上下文管理器"""
-        def timeout_handler():
-            logger.error(f"工作流执行超时 ({self.timeout_seconds}秒)")
-            raise TimeoutException(f"工作流执行超时 ({self.timeout_seconds}秒)")
+        self.on_timeout = on_timeout
+        self.timed_out = threading.Event()
+        self._use_signal = (
+            hasattr(signal, 'SIGALRM')
+            and threading.current_thread() is threading.main_thread()
+        )
+    
+    def _timeout_error(self) -> TimeoutException:
+        """记录并构造超时异常"""
+        self.timed_out.set()
+        logger.error(f"工作流执行超时 ({self.timeout_seconds}秒)")
+        return TimeoutException(f"工作流执行超时 ({self.timeout_seconds}秒)")
         
-        self.timer = threading.Timer(self.timeout_seconds, timeout_handler)
-        self.timer.start()
-        return self
+    def _signal_handler(self, signum, frame):
+        """SIGALRM处理函数，在主线程中抛出超时异常"""
+        raise self._timeout_error()
+    
+    def _run_timeout_cleanup(self):
+        """超时后在调用方线程中执行清理，清理失败不影响超时异常的抛出"""
+        if self.on_timeout:
+            try:
+                self.on_timeout()
+            except Exception as e:
+                logger.warning(f"超时清理失败: {e}")
+    
+    def run(self, func, *args, **kwargs):
+        """
+        在超时限制内执行 func 并返回其结果，超时抛出 TimeoutException
+        Run func within the timeout and return its result, raising TimeoutException on timeout
+        """
+        if self._use_signal:
+            previous_handler = signal.signal(signal.SIGALRM, self._signal_handler)
+            signal.alarm(self.timeout_seconds)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                signal.alarm(0)
+                signal.signal(signal.SIGALRM, previous_handler or signal.SIG_DFL)
+                if self.timed_out.is_set():
+                    self._run_timeout_cleanup()
         
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        """退出上下文管理器"""
-        if self.timer:
-            self.timer.cancel()
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="workflow")
+        try:
+            return pool.submit(func, *args, **kwargs).result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            error = self._timeout_error()
+            # 关闭浏览器等外部资源，使仍在运行的工作线程尽快从阻塞调用中返回
+            self._run_timeout_cleanup()
+            raise error from None
+        finally:
+            # 不等待超时的工作线程结束，避免调用方被继续阻塞
+            _shutdown_pool_nowait(pool)
+
+# 导入时的工作目录 (报告及 /files 文件服务均相对于该目录)，进程生命周期内不变，导入时记录一次
+_CWD_AT_IMPORT = os.getcwd()
+
+@lru_cache(maxsize=1)
+def _cached_api_base_url() -> str:
+    """缓存的API基础URL (环境配置在运行期间不变)"""
+    return get_api_base_url()
+
+@lru_cache(maxsize=1024)
+def _build_image_url(file_path: str, base_url: str) -> Optional[str]:
+    """根据文件路径构建URL (纯字符串计算，可缓存)"""
+    try:
+        rel_path = os.path.relpath(file_path, _CWD_AT_IMPORT)
+        # 将Windows路径分隔符转换为URL格式
+        url_path = rel_path.replace('\\', '/')
+        return f"{base_url.rstrip('/')}/files/{url_path}"
+    except Exception as e:
+        logger.warning(f"路径转换失败: {e}")
+        return None
 
 def get_image_url(file_path, base_url=None):
     """
     获取图片的可访问URL
     Get accessible URL for image files
     """
+    # 存在性检查不缓存，避免文件删除后返回过期结果
     if not file_path or not os.path.exists(file_path):
         return None
     
     # 如果没有指定base_url，则从环境配置获取
     if base_url is None:
-        base_url = get_api_base_url()
+        base_url = _cached_api_base_url()
     
-    # 获取相对于项目根目录的路径
-    project_root = os.getcwd()
+    return _build_image_url(file_path, base_url)
+
+@lru_cache(maxsize=1)
+def _get_prd_case_cache():
+    """
+    PRD测试用例缓存 (首次生成测试用例时才打开，仅导入模块不会创建缓存目录)
+    diskcache不可用时返回None，不启用缓存
+    """
     try:
-        rel_path = os.path.relpath(file_path, project_root)
-        # 将Windows路径分隔符转换为URL格式
-        url_path = rel_path.replace('\\', '/')
-        return f"{base_url.rstrip('/')}/files/{url_path}"
+        from diskcache import Cache
+        return Cache(_PRD_CASE_CACHE_DIR)
     except Exception as e:
-        logger.warning(f"路径转换失败: {e}")
+        logger.warning(f"PRD测试用例缓存不可用: {e}")
         return None
 
+def _figma_design_cache_path(figma_url: str) -> str:
+    """Figma设计稿缓存文件路径 (以URL哈希为键)"""
+    digest = hashlib.sha1(figma_url.encode('utf-8')).hexdigest()
+    return os.path.join(_FIGMA_DESIGN_CACHE_DIR, f"{digest}.png")
+
+def _get_cached_figma_design(figma_url: str) -> Optional[str]:
+    """返回未过期的已缓存设计稿路径，无缓存或已过期时返回None"""
+    cache_path = _figma_design_cache_path(figma_url)
+    try:
+        if time.time() - os.path.getmtime(cache_path) < FIGMA_DESIGN_CACHE_TTL:
+            return cache_path
+    except OSError:
+        pass
+    return None
+
+def _prune_figma_design_cache():
+    """删除已过期的设计稿缓存 (含异常中断遗留的临时文件)，防止缓存目录无限增长"""
+    expire_before = time.time() - FIGMA_DESIGN_CACHE_TTL
+    with os.scandir(_FIGMA_DESIGN_CACHE_DIR) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < expire_before:
+                    os.remove(entry.path)
+            except OSError:
+                # 可能已被并发请求删除或替换
+                pass
+
+def _store_figma_design(figma_url: str, image_path: str):
+    """将新获取的设计稿写入缓存 (先写临时文件再原子替换，避免并发请求读到半个文件)"""
+    cache_path = _figma_design_cache_path(figma_url)
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(_FIGMA_DESIGN_CACHE_DIR, exist_ok=True)
+        shutil.copyfile(image_path, tmp_path)
+        os.replace(tmp_path, cache_path)
+        _prune_figma_design_cache()
+    except OSError as e:
+        logger.warning(f"写入Figma设计稿缓存失败: {e}")
+
+def _create_screenshot_capture():
+    from ..screenshot.capture import ScreenshotCapture
+    return ScreenshotCapture()
+
+def _create_figma_client():
+    from ..figma.client import FigmaClient
+    return FigmaClient()
+
+def _create_figma_screenshot_service():
+    from ..screenshot.figma_screenshot_service import FigmaScreenshotService
+    return FigmaScreenshotService()
+
+def _create_hybrid_screenshot_service():
+    from ..screenshot.figma_screenshot_service import HybridScreenshotService
+    return HybridScreenshotService(prefer_figma_api=True)
+
+def _create_visual_comparator():
+    from ..visual_comparison.comparator import VisualComparator
+    return VisualComparator()
+
+# 按需初始化的组件: 属性名 -> (名称, 工厂函数, 清理时调用的释放方法)
+_LAZY_COMPONENTS = {
+    'screenshot_capture': ("截图捕获器", _create_screenshot_capture, '_cleanup_processes'),
+    'figma_client': ("Figma客户端", _create_figma_client, None),
+    'figma_screenshot_service': ("Figma截图服务", _create_figma_screenshot_service, 'cleanup'),
+    'hybrid_screenshot_service': ("混合截图服务", _create_hybrid_screenshot_service, 'cleanup'),
+    'visual_comparator': ("视觉比较器", _create_visual_comparator, None),
+}
+
 class WorkflowExecutor:
     """工作流执行器 Workflow Executor"""
     
@@ -88,113 +283,92 @@ class WorkflowExecutor:
     MAX_AI_GENERATION_TIME = 120  # 2分钟AI生成超时 (从3分钟减少)
     MAX_COMPARISON_TIME = 30   # 30秒比较超时 (从1分钟减少)
     
+    # 相似度高于该值视为无明显差异，跳过差异图和详细报告
+    NO_DIFF_SIMILARITY_THRESHOLD = 0.99
+    
     def __init__(self):
         """初始化执行器 Initialize executor"""
-        self.feishu_client = FeishuClient()
-        self.gemini_generator = GeminiCaseGenerator()
-        self.screenshot_capture = None  # 延迟初始化以节省内存
-        self.figma_client = None       # 延迟初始化以节省内存
-        self.figma_screenshot_service = None  # 延迟初始化以节省内存
-        self.hybrid_screenshot_service = None  # 延迟初始化以节省内存
-        self.visual_comparator = None  # 延迟初始化以节省内存
+        # 重量级组件延迟初始化以节省内存
+        for component_name in _LAZY_COMPONENTS:
+            setattr(self, component_name, None)
         
         # 资源监控
-        self.process = psutil.Process()
         self.start_memory = None
+    
+    @cached_property
+    def feishu_client(self) -> FeishuClient:
+        """飞书客户端 (首次使用时创建)"""
+        return FeishuClient()
+    
+    @cached_property
+    def gemini_generator(self):
+        """Gemini测试用例生成器 (仅生成测试用例时才加载)"""
+        from ..ai_analysis.gemini_case_generator import GeminiCaseGenerator
+        return GeminiCaseGenerator()
+    
+    @cached_property
+    def process(self):
+        """当前进程句柄，用于资源监控"""
+        import psutil
+        return psutil.Process()
         
     def _log_resource_usage(self, stage: str):
         """记录资源使用情况"""
         try:
+            # 仅读取内存信息；cpu_percent 需要额外读取 /proc 且瞬时值意义不大
             memory_info = self.process.memory_info()
             memory_mb = memory_info.rss / 1024 / 1024
-            cpu_percent = self.process.cpu_percent()
             
             if self.start_memory is None:
                 self.start_memory = memory_mb
             
             memory_increase = memory_mb - self.start_memory
             
-            logger.info(f"[{stage}] 内存: {memory_mb:.1f}MB (+{memory_increase:.1f}MB), CPU: {cpu_percent:.1f}%")
+            logger.info(f"[{stage}] 内存: {memory_mb:.1f}MB (+{memory_increase:.1f}MB)")
             
-            # 内存使用警告和限制
+            # 内存使用警告（不在流程中途做完整垃圾回收，避免长时间停顿）
             if memory_mb > 1024:  # 1GB
                 logger.warning(f"内存使用过高: {memory_mb:.1f}MB")
-                # 强制垃圾回收以释放内存
-                import gc
-                gc.collect()
-                logger.info("已执行垃圾回收以释放内存")
             
             # 严重内存警告
             if memory_mb > 2048:  # 2GB
                 logger.error(f"内存使用严重过高: {memory_mb:.1f}MB，建议优化或增加内存")
                 # 清理所有组件
-                self._cleanup_component('screenshot_capture')
-                self._cleanup_component('figma_client')
-                self._cleanup_component('visual_comparator')
+                self._cleanup_components('screenshot_capture', 'figma_client', 'visual_comparator')
                 
         except Exception as e:
             logger.warning(f"资源监控失败: {e}")
     
     def _initialize_component_if_needed(self, component_name: str):
         """按需初始化组件以节省内存"""
-        if component_name == 'screenshot_capture' and self.screenshot_capture is None:
-            logger.info("初始化截图捕获器")
-            self.screenshot_capture = ScreenshotCapture()
-            
-        elif component_name == 'figma_client' and self.figma_client is None:
-            logger.info("初始化Figma客户端")
-            self.figma_client = FigmaClient()
-            
-        elif component_name == 'figma_screenshot_service' and self.figma_screenshot_service is None:
-            logger.info("初始化Figma截图服务")
-            self.figma_screenshot_service = FigmaScreenshotService()
-            
-        elif component_name == 'hybrid_screenshot_service' and self.hybrid_screenshot_service is None:
-            logger.info("初始化混合截图服务")
-            self.hybrid_screenshot_service = HybridScreenshotService(prefer_figma_api=True)
-            
-        elif component_name == 'visual_comparator' and self.visual_comparator is None:
-            logger.info("初始化视觉比较器")
-            self.visual_comparator = VisualComparator()
+        if getattr(self, component_name) is None:
+            label, factory, _ = _LAZY_COMPONENTS[component_name]
+            logger.info(f"初始化{label}")
+            setattr(self, component_name, factory())
     
     def _cleanup_component(self, component_name: str):
         """清理组件以释放内存"""
-        if component_name == 'screenshot_capture' and self.screenshot_capture:
-            try:
-                # 确保浏览器进程被清理
-                self.screenshot_capture._cleanup_processes()
-                self.screenshot_capture = None
-                logger.info("已清理截图捕获器")
-            except Exception as e:
-                logger.warning(f"清理截图捕获器失败: {e}")
-                
-        elif component_name == 'figma_client' and self.figma_client:
-            self.figma_client = None
-            logger.info("已清理Figma客户端")
-            
-        elif component_name == 'figma_screenshot_service' and self.figma_screenshot_service:
-            try:
-                self.figma_screenshot_service.cleanup()
-                self.figma_screenshot_service = None
-                logger.info("已清理Figma截图服务")
-            except Exception as e:
-                logger.warning(f"清理Figma截图服务失败: {e}")
-                
-        elif component_name == 'hybrid_screenshot_service' and self.hybrid_screenshot_service:
+        component = getattr(self, component_name)
+        if component:
+            label, _, release_method = _LAZY_COMPONENTS[component_name]
             try:
-                self.hybrid_screenshot_service.cleanup()
-                self.hybrid_screenshot_service = None
-                logger.info("已清理混合截图服务")
+                # 确保浏览器进程等外部资源被释放
+                if release_method:
+                    getattr(component, release_method)()
+                setattr(self, component_name, None)
+                logger.info(f"已清理{label}")
             except Exception as e:
-                logger.warning(f"清理混合截图服务失败: {e}")
-            
-        elif component_name == 'visual_comparator' and self.visual_comparator:
-            self.visual_comparator = None
-            logger.info("已清理视觉比较器")
-        
-        # 强制垃圾回收
-        import gc
-        gc.collect()
+                logger.warning(f"清理{label}失败: {e}")
+    
+    def _cleanup_components(self, *component_names: str):
+        """批量清理组件，全部释放后只执行一次完整垃圾回收"""
+        for component_name in component_names:
+            self._cleanup_component(component_name)
+        gc.collect(2)
+    
+    def _cleanup_after_timeout(self):
+        """超时后关闭浏览器驱动并释放组件，终止仍在运行的截图进程"""
+        self._cleanup_components('screenshot_capture', 'visual_comparator')
     
     def _cleanup_old_reports(self, reports_dir: str):
         """
@@ -204,18 +378,25 @@ class WorkflowExecutor:
             os.makedirs(reports_dir, exist_ok=True)
             return
 
-        # 找到所有 comparison_ 开头的文件夹，全部删除
-        comparison_dirs = [
-            os.path.join(reports_dir, d)
-            for d in os.listdir(reports_dir)
-            if d.startswith("comparison_") and os.path.isdir(os.path.join(reports_dir, d))
-        ]
-        for old_dir in comparison_dirs:
+        # 找到所有 comparison_ 开头的文件夹 (scandir 无需逐个 stat)
+        with os.scandir(reports_dir) as entries:
+            comparison_dirs = [
+                entry.path
+                for entry in entries
+                if entry.name.startswith("comparison_") and entry.is_dir(follow_symlinks=False)
+            ]
+        if not comparison_dirs:
+            return
+        
+        def remove_dir(old_dir: str):
             try:
                 shutil.rmtree(old_dir)
             except Exception as e:
-    
                 logger.warning(f"删除旧对比目录失败: {old_dir}, {e}")
+        
+        # 并行删除，目录较多时减少等待
+        with ThreadPoolExecutor(max_workers=min(8, len(comparison_dirs))) as pool:
+            list(pool.map(remove_dir, comparison_dirs))
     
     def execute_button_click(self, 
                            app_token: str,
@@ -230,7 +411,8 @@ class WorkflowExecutor:
                            test_type: str = "完整测试",
                            cookies: dict = None,
                            local_storage: dict = None,
-                           browser_language: str = None) -> Dict[str, Any]:
+                           browser_language: str = None,
+                           force_refresh: bool = False) -> Dict[str, Any]:
         """
         执行飞书多维表格按钮点击的工作流
         Execute workflow for Feishu multidimensional table button click
@@ -246,79 +428,36 @@ class WorkflowExecutor:
             device: 设备类型 device type
             output_dir: 输出目录 output directory
             test_type: 测试类型 test type ("功能测试", "UI测试", "完整测试")
+            force_refresh: 忽略PRD测试用例及Figma设计稿缓存 bypass the PRD test case and Figma design caches
             
         Returns:
             执行结果 execution result
         """
         logger.info(f"开始执行工作流 / Starting workflow execution - 测试类型: {test_type}")
         
+        started_at = time.time()
         result = {
             "status": "success",
-            "timestamp": int(time.time()),
+            "timestamp": int(started_at),
+            "started_at": time.strftime(TIMESTAMP_FORMAT, time.localtime(started_at)),
             "test_type": test_type,
             "test_cases": None,
             "comparison_result": None,
             "bitable_updates": {},
+            "status_updates": [],
             "errors": []
         }
         
         try:
-            # 步骤0: 更新状态为"进行中"
-            logger.info("步骤0: 更新执行状态为进行中")
-            self._update_execution_status(app_token, table_id, record_id, "进行中")
-            result["status_updates"] = ["进行中"]
-            test_cases = None
-            comparison_result = None
-            
-            # 根据测试类型执行不同的步骤
-            if test_type == "功能测试":
-                # 只执行PRD解析和测试用例生成
-                logger.info("执行功能测试: 解析PRD文档并生成测试用例")
-                test_cases = self._generate_test_cases_from_prd(prd_document_token)
-                result["test_cases"] = test_cases
-                logger.info("功能测试完成，跳过视觉比较")
-                
-            elif test_type == "UI测试":
-                # 只执行Figma与网站的视觉比较
-                logger.info("执行UI测试: 比较Figma设计和网站")
-                comparison_result = self._compare_figma_and_website(
-                    figma_url, website_url, xpath_selector, device, output_dir,
-                    cookies, local_storage, browser_language
-                )
-                result["comparison_result"] = comparison_result
-                logger.info("UI测试完成，跳过PRD解析")
-                
-            else:
-                # 默认执行完整测试（兼容原有行为）
-                logger.info("执行完整测试: PRD解析 + 视觉比较")
-                
-                # 步骤1: 解析PRD文档生成测试用例
-                logger.info("步骤1: 解析PRD文档并生成测试用例")
-                test_cases = self._generate_test_cases_from_prd(prd_document_token)
-                result["test_cases"] = test_cases
-                
-                # 步骤2: 比较Figma设计和网站
-                logger.info("步骤2: 比较Figma设计和网站")
-                comparison_result = self._compare_figma_and_website(
-                    figma_url, website_url, xpath_selector, device, output_dir,
-                    cookies, local_storage, browser_language
-                )
-                result["comparison_result"] = comparison_result
-            
-            # 步骤3: 更新多维表格（所有测试类型都需要更新）
-            logger.info("步骤3: 更新多维表格")
-            bitable_updates = self._update_bitable_record(
-                app_token, table_id, record_id, test_cases, comparison_result
+            timeout_handler = WorkflowTimeoutHandler(
+                self.MAX_EXECUTION_TIME, on_timeout=self._cleanup_after_timeout
+            )
+            return timeout_handler.run(
+                self._run_workflow_steps, result, timeout_handler.timed_out,
+                app_token, table_id, record_id, prd_document_token, figma_url, website_url,
+                xpath_selector, device, output_dir, test_type, cookies, local_storage,
+                browser_language, force_refresh
             )
-            result["bitable_updates"] = bitable_updates
-            
-            # 步骤4: 更新状态为"已完成"
-            logger.info("步骤4: 更新执行状态为已完成")
-            self._update_execution_status(app_token, table_id, record_id, "已完成")
-            result["status_updates"].append("已完成")
-            
-            logger.info(f"工作流执行完成 / Workflow execution completed - 测试类型: {test_type}")
-            return result
             
         except Exception as e:
             logger.error(f"工作流执行失败: {e}")
@@ -335,73 +474,143 @@ class WorkflowExecutor:
             result["errors"].append(str(e))
             return result
     
-    def _generate_test_cases_from_prd(self, document_input: str) -> Dict[str, Any]:
+    def _run_workflow_steps(self, result: Dict[str, Any], timed_out: threading.Event,
+                            app_token: str, table_id: str, record_id: str,
+                            prd_document_token: str, figma_url: str, website_url: str,
+                            xpath_selector: str, device: str, output_dir: str, test_type: str,
+                            cookies: dict, local_storage: dict, browser_language: str,
+                            force_refresh: bool) -> Dict[str, Any]:
+        """
+        执行工作流各步骤 (由 execute_button_click 在超时限制内调用)
+        Run the workflow steps (called by execute_button_click under the timeout)
+        
+        Args:
+            result: 执行结果，各步骤完成后写入 execution result filled in as steps complete
+            timed_out: 超时标志，已超时则不再写回多维表格 timeout flag; skip bitable writes once set
+        """
+        # 步骤0: 更新状态为"进行中"
+        logger.info("步骤0: 更新执行状态为进行中")
+        self._update_execution_status(app_token, table_id, record_id, "进行中")
+        result["status_updates"] = ["进行中"]
+        test_cases = None
+        comparison_result = None
+    
+        # 根据测试类型执行不同的步骤
+        if test_type == "功能测试":
+            # 只执行PRD解析和测试用例生成
+            logger.info("执行功能测试: 解析PRD文档并生成测试用例")
+            test_cases = self._generate_test_cases_from_prd(prd_document_token, force_refresh=force_refresh)
+            result["test_cases"] = test_cases
+            logger.info("功能测试完成，跳过视觉比较")
+        
+        elif test_type == "UI测试":
+            # 只执行Figma与网站的视觉比较
+            logger.info("执行UI测试: 比较Figma设计和网站")
+            comparison_result = self._compare_figma_and_website(
+                figma_url, website_url, xpath_selector, device, output_dir,
+                cookies, local_storage, browser_language, force_refresh=force_refresh
+            )
+            result["comparison_result"] = comparison_result
+            logger.info("UI测试完成，跳过PRD解析")
+        
+        else:
+            # 默认执行完整测试（兼容原有行为）
+            logger.info("执行完整测试: PRD解析 + 视觉比较")
+        
+            # 步骤1: 解析PRD文档生成测试用例
+            logger.info("步骤1: 解析PRD文档并生成测试用例")
+            test_cases = self._generate_test_cases_from_prd(prd_document_token, force_refresh=force_refresh)
+            result["test_cases"] = test_cases
+        
+            # 步骤2: 比较Figma设计和网站
+            logger.info("步骤2: 比较Figma设计和网站")
+            comparison_result = self._compare_figma_and_website(
+                figma_url, website_url, xpath_selector, device, output_dir,
+                cookies, local_storage, browser_language, force_refresh=force_refresh
+            )
+            result["comparison_result"] = comparison_result
+    
+        # 已超时时调用方已将状态写为"失败"，不再覆盖
+        if timed_out.is_set():
+            raise TimeoutException("工作流已超时，放弃写回多维表格")
+    
+        # 步骤3: 更新多维表格并将状态置为"已完成"（合并为一次API调用）
+        logger.info("步骤3: 更新多维表格及执行状态")
+        bitable_updates = self._update_bitable_record(
+            app_token, table_id, record_id, test_cases, comparison_result,
+            extra_status="已完成"
+        )
+        result["bitable_updates"] = bitable_updates
+        result["status_updates"].append("已完成")
+    
+        logger.info(f"工作流执行完成 / Workflow execution completed - 测试类型: {test_type}")
+        return result
+    
+    def _generate_test_cases_from_prd(self, document_input: str, force_refresh: bool = False) -> Dict[str, Any]:
         """
         从PRD文档生成测试用例 (支持完整链接或token)
         Generate test cases from PRD document (supports full URL or token)
         
         Args:
             document_input: 文档链接或token (document URL or token)
+            force_refresh: 忽略缓存重新生成 (bypass cache and regenerate)
         """
         try:
             # 解析PRD文档 (新方法自动处理完整链接或token)
             prd_result = self.feishu_client.parse_prd_document(document_input)
             prd_text = prd_result['text_content']
             
+            # 文档内容未变化时直接返回缓存结果，跳过Gemini调用
+            content_hash = hashlib.sha1(prd_text.encode('utf-8')).hexdigest()
+            cache_key = (prd_result.get('document_token', str(document_input)), content_hash)
+            prd_case_cache = _get_prd_case_cache()
+            if prd_case_cache is not None and not force_refresh:
+                cached_result = prd_case_cache.get(cache_key)
+                if cached_result is not None:
+                    logger.info(f"命中PRD测试用例缓存: {cache_key[0]}")
+                    return dict(cached_result, document_input=document_input)
+            
             # 使用AI生成测试用例
             try:
                 test_cases_text = self.gemini_generator.generate_test_cases(prd_text, case_count=10)
                 
-                return {
+                result = {
                     "document_input": document_input,
                     "prd_text_length": len(prd_text),
                     "test_cases_text": test_cases_text,
-                    "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "generated_at": time.strftime(TIMESTAMP_FORMAT),
                     "api_status": "success"
                 }
                 
+                # 只缓存成功的生成结果
+                if prd_case_cache is not None:
+                    try:
+                        prd_case_cache.set(cache_key, result)
+                    except Exception as cache_error:
+                        logger.warning(f"写入PRD测试用例缓存失败: {cache_error}")
+                
+                return result
+                
             except Exception as api_error:
                 # Gemini API调用失败，记录错误信息
                 error_message = str(api_error)
                 logger.error(f"Gemini API调用失败: {error_message}")
+                failed_at = time.strftime(TIMESTAMP_FORMAT)
                 
                 # 创建包含错误信息的测试用例文档
-                error_report = f"""# ⚠️ 测试用例生成失败
-
-## 错误信息
-**Gemini API调用失败**: {error_message}
-
-## 详细说明
-- **时间**: {time.strftime("%Y-%m-%d %H:%M:%S")}
-- **PRD文档**: {document_input}
-- **PRD文本长度**: {len(prd_text)} 字符
-- **错误类型**: API服务不可用
-
-## 可能的原因
-1. **地理位置限制**: Gemini API在当前地区不可用
-2. **网络连接问题**: 无法连接到Google AI服务
-3. **API配置错误**: API密钥或配置有误
-4. **服务超时**: API响应时间过长
-
-## 建议解决方案
-1. **检查网络**: 确认网络连接正常
-2. **更换地区**: 尝试使用VPN或其他网络环境  
-3. **验证配置**: 检查GEMINI_API_KEY环境变量
-4. **稍后重试**: 等待服务恢复后重新执行
-
-## PRD文档内容预览
-```
-{prd_text[:500]}{"..." if len(prd_text) > 500 else ""}
-```
-
-*注意: 可以手动基于上述PRD内容编写测试用例，或等待API服务恢复后重新执行工作流。*
-"""
+                error_report = _ERROR_REPORT_TEMPLATE.format(
+                    error_message=error_message,
+                    failed_at=failed_at,
+                    document_input=document_input,
+                    prd_text_length=len(prd_text),
+                    prd_preview=prd_text[:500] + ("..." if len(prd_text) > 500 else "")
+                )
                 
                 return {
                     "document_input": document_input,
                     "prd_text_length": len(prd_text),
                     "test_cases_text": error_report,
-                    "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "generated_at": failed_at,
                     "api_status": "failed",
                     "api_error": error_message
                 }
@@ -418,10 +627,15 @@ class WorkflowExecutor:
                                  output_dir: str = "reports",
                                  cookies: dict = None,
                                  local_storage: dict = None,
-                                 browser_language: str = None) -> Dict[str, Any]:
+                                 browser_language: str = None,
+                                 figma_cache: Optional[Dict[str, str]] = None,
+                                 force_refresh: bool = False) -> Dict[str, Any]:
         """
         比较Figma设计和网站
         Compare Figma design and website
+        
+        figma_cache: 可选的 Figma URL -> 已下载设计稿路径 映射，批量比较时同一设计稿只获取一次
+        force_refresh: 忽略已缓存的设计稿重新从Figma获取 (设计稿刚修改时使用)
         """
         try:
             self._log_resource_usage("开始视觉比较")
@@ -434,157 +648,93 @@ class WorkflowExecutor:
             current_output_dir = os.path.join(output_dir, f"comparison_{timestamp}")
             os.makedirs(current_output_dir, exist_ok=True)
             
-            # 1. 网页截图 (按需初始化截图捕获器)
-            self._initialize_component_if_needed('screenshot_capture')
-            website_screenshot_path = os.path.join(current_output_dir, f"website_{device}.png")
-            
-            logger.info("开始网页截图")
-            if xpath_selector:
-                # 按XPath截图
-                logger.info(f"使用XPath截图: {xpath_selector}")
-                self.screenshot_capture.capture_by_xpath(
-                    url=website_url,
-                    xpath=xpath_selector,
-                    output_dir=current_output_dir,
-                    device=device,
-                    wait_time=5,  # 减少等待时间以提高效率
-                    cookies=cookies,
-                    local_storage=local_storage,
-                    browser_language=browser_language
-                )
-                # 重命名文件为标准格式
-                xpath_filename = self.screenshot_capture.build_filename_from_xpath(
-                    xpath_selector, device, website_url
-                )
-                original_path = os.path.join(current_output_dir, xpath_filename)
-                if os.path.exists(original_path):
-                    os.rename(original_path, website_screenshot_path)
-                    logger.info(f"XPath截图已保存: {website_screenshot_path}")
+            # 2. Figma截图 (使用新的API截图服务)
+            # 与网页截图互不依赖，在后台线程中获取，与浏览器截图并行执行
+            figma_image_path = os.path.join(current_output_dir, "figma_design.png")
+            cached_figma_path = None
+            if not force_refresh:
+                cached_figma_path = figma_cache.get(figma_url) if figma_cache is not None else None
+                if not (cached_figma_path and os.path.exists(cached_figma_path)):
+                    cached_figma_path = _get_cached_figma_design(figma_url)
+            # 显式管理线程池: 超时(SIGALRM)等异常中断时不等待后台的Figma下载完成
+            pool = ThreadPoolExecutor(max_workers=1)
+            try:
+                if cached_figma_path and os.path.exists(cached_figma_path):
+                    logger.info(f"复用已获取的Figma设计稿: {cached_figma_path}")
+                    figma_future = pool.submit(shutil.copyfile, cached_figma_path, figma_image_path)
+                    figma_fetched = False
                 else:
-                    logger.warning(f"XPath截图文件未找到: {original_path}")
-            else:
-                # 全页截图
-                logger.info("使用全页截图")
-                self.screenshot_capture.capture_full_page(
-                    url=website_url,
-                    output_path=website_screenshot_path,
-                    device=device,
-                    wait_time=5,  # 减少等待时间以提高效率
-                    cookies=cookies,
-                    local_storage=local_storage,
-                    browser_language=browser_language
-                )
+                    figma_future = pool.submit(self._fetch_figma_design, figma_url, figma_image_path)
+                    figma_fetched = True
+                
+                # 1. 网页截图 (按需初始化截图捕获器)
+                self._initialize_component_if_needed('screenshot_capture')
+                website_screenshot_path = os.path.join(current_output_dir, f"website_{device}.png")
             
-            self._log_resource_usage("网页截图完成")
+                logger.info("开始网页截图")
+                if xpath_selector:
+                    # 按XPath截图
+                    logger.info(f"使用XPath截图: {xpath_selector}")
+                    self.screenshot_capture.capture_by_xpath(
+                        url=website_url,
+                        xpath=xpath_selector,
+                        output_dir=current_output_dir,
+                        device=device,
+                        wait_time=5,  # 减少等待时间以提高效率
+                        cookies=cookies,
+                        local_storage=local_storage,
+                        browser_language=browser_language
+                    )
+                    # 重命名文件为标准格式
+                    xpath_filename = self.screenshot_capture.build_filename_from_xpath(
+                        xpath_selector, device, website_url
+                    )
+                    original_path = os.path.join(current_output_dir, xpath_filename)
+                    try:
+                        # os.replace 原子覆盖目标文件，避免先检查再重命名的竞争
+                        os.replace(original_path, website_screenshot_path)
+                        logger.info(f"XPath截图已保存: {website_screenshot_path}")
+                    except FileNotFoundError:
+                        logger.warning(f"XPath截图文件未找到: {original_path}")
+                else:
+                    # 全页截图
+                    logger.info("使用全页截图")
+                    self.screenshot_capture.capture_full_page(
+                        url=website_url,
+                        output_path=website_screenshot_path,
+                        device=device,
+                        wait_time=5,  # 减少等待时间以提高效率
+                        cookies=cookies,
+                        local_storage=local_storage,
+                        browser_language=browser_language
+                    )
             
-            # 2. Figma截图 (使用新的API截图服务)
-            self._initialize_component_if_needed('figma_screenshot_service')
-            figma_image_path = os.path.join(current_output_dir, "figma_design.png")
+                self._log_resource_usage("网页截图完成")
             
-            logger.info("开始Figma设计稿获取（使用API截图）")
+                figma_future.result()
+            finally:
+                _shutdown_pool_nowait(pool)
             
-            try:
-                # 使用新的 Figma API 截图服务
-                screenshot_path = self.figma_screenshot_service.capture_figma_node(
-                    figma_url=figma_url,
-                    output_path=figma_image_path,
-                    format="png",
-                    scale=2.0
-                )
-                
-                # 如果返回的路径与期望的不同，重命名文件
-                if screenshot_path != figma_image_path and os.path.exists(screenshot_path):
-                    import shutil
-                    shutil.move(screenshot_path, figma_image_path)
-                    logger.info(f"Figma截图文件已重命名: {figma_image_path}")
-                
-                logger.info(f"Figma API截图完成: {figma_image_path}")
-                
-            except Exception as e:
-                logger.warning(f"Figma API截图失败，回退到传统方法: {e}")
-                
-                # 回退到传统方法
-                self._initialize_component_if_needed('figma_client')
-                figma_info = self.figma_client.parse_figma_url(figma_url)
-                
-                # 导出Figma图片
-                node_id = figma_info.get('node_id')
-                if not node_id:
-                    # 如果没有节点ID，获取文件信息并使用第一个页面
-                    file_info = self.figma_client.get_file_info(figma_info['file_id'])
-                    pages = file_info.get('document', {}).get('children', [])
-                    if pages:
-                        node_id = pages[0]['id']
-                    else:
-                        raise ValueError("无法找到可用的节点ID")
-                
-                # 调用export_images方法
-                image_urls = self.figma_client.export_images(
-                    file_id=figma_info['file_id'],
-                    node_ids=[node_id],
-                    format='webp',
-                    scale=2.0
-                )
-                
-                # 获取图片URL - 处理节点ID格式转换
-                if not image_urls:
-                    raise ValueError(f"Figma API没有返回任何图片URL")
-                
-                # 尝试不同的节点ID格式（URL格式和API格式）
-                figma_image_url = None
-                actual_node_id = None
-                
-                # 方法1：直接使用原始节点ID
-                if node_id in image_urls and image_urls[node_id]:
-                    figma_image_url = image_urls[node_id]
-                    actual_node_id = node_id
-                
-                # 方法2：转换横线为冒号（URL格式 -> API格式）
-                if not figma_image_url:
-                    api_format_node_id = node_id.replace('-', ':')
-                    if api_format_node_id in image_urls and image_urls[api_format_node_id]:
-                        figma_image_url = image_urls[api_format_node_id]
-                        actual_node_id = api_format_node_id
-                
-                # 方法3：使用第一个可用的URL
-                if not figma_image_url:
-                    for key, url in image_urls.items():
-                        if url:  # 确保URL不为空
-                            figma_image_url = url
-                            actual_node_id = key
-                            break
-                
-                if not figma_image_url:
-                    available_nodes = list(image_urls.keys())
-                    raise ValueError(f"无法获取节点 {node_id} 的图片URL。可用节点: {available_nodes}")
-                
-                logger.info(f"使用节点ID: {actual_node_id} (原始: {node_id})")
-                
-                # 下载Figma图片
-                self.figma_client.download_image(figma_image_url, figma_image_path)
+            if figma_fetched:
+                _store_figma_design(figma_url, figma_image_path)
+            if figma_cache is not None:
+                figma_cache[figma_url] = figma_image_path
             
-            # 3. 视觉比较 (按需初始化视觉比较器)
+            # 3. 视觉比较并生成报告 (按需初始化视觉比较器)
             self._initialize_component_if_needed('visual_comparator')
+            report_path = os.path.join(current_output_dir, "comparison_report.json")
             comparison_result = self.visual_comparator.compare_images(
                 image1_path=website_screenshot_path,
                 image2_path=figma_image_path,
-                output_dir=current_output_dir
+                output_dir=current_output_dir,
+                skip_diff_above=self.NO_DIFF_SIMILARITY_THRESHOLD,
+                report_path=report_path
             )
             
-            self._log_resource_usage("视觉比较完成")
+            self._log_resource_usage("视觉比较及报告生成完成")
             
-            # 4. 生成报告
-            report_path = os.path.join(current_output_dir, "comparison_report.json")
-            self.visual_comparator.generate_report(comparison_result, report_path)
-            
-            self._log_resource_usage("报告生成完成")
-            
-            # 5. 清理组件以释放内存
-            self._cleanup_component('screenshot_capture')
-            self._cleanup_component('figma_client')
-            self._cleanup_component('figma_screenshot_service')
-            self._cleanup_component('hybrid_screenshot_service')
-            self._cleanup_component('visual_comparator')
+            # 4. 清理组件以释放内存
+            self._cleanup_components(*_LAZY_COMPONENTS)
             
             self._log_resource_usage("组件清理完成")
             
@@ -605,22 +755,97 @@ class WorkflowExecutor:
                     "diff_image_path": comparison_result.diff_image_path
                 },
                 "report_path": report_path,
-                "compared_at": time.strftime("%Y-%m-%d %H:%M:%S")
+                "compared_at": time.strftime(TIMESTAMP_FORMAT)
             }
             
         except Exception as e:
             logger.error(f"视觉比较失败: {e}")
             raise
     
+    def _fetch_figma_design(self, figma_url: str, figma_image_path: str):
+        """
+        获取Figma设计稿图片（优先API截图服务，失败时回退到导出接口）
+        Fetch the Figma design image, falling back to the export API
+        
+        在后台线程中与网页截图并行运行，使用局部创建的客户端而不是执行器上共享的组件属性，
+        避免主线程的内存紧急清理或其他并发请求在获取过程中将其置空
+        """
+        figma_screenshot_service = _create_figma_screenshot_service()
+        
+        logger.info("开始Figma设计稿获取（使用API截图）")
+        
+        try:
+            # 使用新的 Figma API 截图服务
+            screenshot_path = figma_screenshot_service.capture_figma_node(
+                figma_url=figma_url,
+                output_path=figma_image_path,
+                format="png",
+                scale=2.0
+            )
+            
+            # 如果返回的路径与期望的不同，重命名文件
+            if screenshot_path != figma_image_path and os.path.exists(screenshot_path):
+                shutil.move(screenshot_path, figma_image_path)
+                logger.info(f"Figma截图文件已重命名: {figma_image_path}")
+            
+            logger.info(f"Figma API截图完成: {figma_image_path}")
+        
+        except Exception as e:
+            logger.warning(f"Figma API截图失败，回退到传统方法: {e}")
+            
+            # 回退到传统方法
+            figma_client = _create_figma_client()
+            figma_info = figma_client.parse_figma_url(figma_url)
+            
+            # 导出Figma图片
+            node_id = figma_info.get('node_id')
+            if not node_id:
+                # 如果没有节点ID，获取文件信息并使用第一个页面
+                file_info = figma_client.get_file_info(figma_info['file_id'])
+                pages = file_info.get('document', {}).get('children', [])
+                if pages:
+                    node_id = pages[0]['id']
+                else:
+                    raise ValueError("无法找到可用的节点ID")
+            
+            # Figma API 返回的键使用冒号分隔，URL中使用连字符，统一转换为API格式
+            api_node_id = node_id.replace('-', ':')
+            
+            # 调用export_images方法
+            image_urls = figma_client.export_images(
+                file_id=figma_info['file_id'],
+                node_ids=[api_node_id],
+                format='webp',
+                scale=2.0
+            )
+            
+            figma_image_url = image_urls.get(api_node_id)
+            if not figma_image_url:
+                available_nodes = list(image_urls.keys())
+                raise ValueError(f"无法获取节点 {api_node_id} 的图片URL。可用节点: {available_nodes}")
+            
+            logger.info(f"使用节点ID: {api_node_id} (原始: {node_id})")
+            
+            # 下载Figma图片
+            figma_client.download_image(figma_image_url, figma_image_path)
+        
+        finally:
+            figma_screenshot_service.cleanup()
+    
     def _update_bitable_record(self, 
                              app_token: str, 
                              table_id: str, 
                              record_id: str,
                              test_cases: Dict[str, Any],
-                             comparison_result: Dict[str, Any]) -> Dict[str, Any]:
+                             comparison_result: Dict[str, Any],
+                             extra_status: Optional[str] = None) -> Dict[str, Any]:
         """
         更新多维表格记录
         Update bitable record
+        
+        Args:
+            extra_status: 同时写入的执行状态，避免额外的状态更新请求
+                          (execution status written in the same request)
         """
         try:
             # 准备更新字段
@@ -647,6 +872,10 @@ class WorkflowExecutor:
             else:
                 update_fields['执行结果'] = "已完成"
             
+            # 合并执行状态更新
+            if extra_status:
+                update_fields['执行状态'] = extra_status
+            
             # 执行更新
             updated_record = self.feishu_client.update_bitable_record(
                 app_token=app_token,
@@ -661,7 +890,7 @@ class WorkflowExecutor:
                 "record_id": record_id,
                 "updated_fields": list(update_fields.keys()),
                 "update_result": updated_record,
-                "updated_at": time.strftime("%Y-%m-%d %H:%M:%S")
+                "updated_at": time.strftime(TIMESTAMP_FORMAT)
             }
             
         except Exception as e:
@@ -706,7 +935,7 @@ class WorkflowExecutor:
                 "record_id": record_id,
                 "status": status,
                 "update_result": updated_record,
-                "updated_at": time.strftime("%Y-%m-%d %H:%M:%S")
+                "updated_at": time.strftime(TIMESTAMP_FORMAT)
             }
             
         except Exception as e:
@@ -720,6 +949,15 @@ class WorkflowExecutor:
         Format similarity report
         """
         comp_data = comparison_result.get('comparison_result', {})
+        similarity_score = comp_data.get('similarity_score', 0)
+        
+        # 无明显差异时只输出简要报告
+        if similarity_score > self.NO_DIFF_SIMILARITY_THRESHOLD:
+            return f"""# 网站与Figma设计相似度报告
+
+- **总体相似度**: {similarity_score:.3f} ({self._get_similarity_rating(similarity_score)})，无明显差异
+- **对比时间**: {comparison_result.get('compared_at', 'N/A')}
+"""
         
         # 尝试读取完整的比较报告文件以获取recommendations
         recommendations = []
@@ -728,15 +966,20 @@ class WorkflowExecutor:
         report_path = comparison_result.get('report_path')
         if report_path and os.path.exists(report_path):
             try:
-                import json
-                with open(report_path, 'r', encoding='utf-8') as f:
-                    full_report = json.load(f)
-                    recommendations = full_report.get('recommendations', [])
-                    detailed_analysis = full_report.get('analysis', {})
+                if orjson is not None:
+                    # orjson 直接解析原始字节，无需先解码为str
+                    with open(report_path, 'rb') as f:
+                        full_report = orjson.loads(f.read())
+                else:
+                    with open(report_path, 'r', encoding='utf-8') as f:
+                        full_report = json.load(f)
+                recommendations = full_report.get('recommendations', [])
+                detailed_analysis = full_report.get('analysis', {})
             except Exception as e:
-                logger.warning(f"无法读取详细报告文件: {e}")
+                logger.warning(f"无法读取详细报告文件 {report_path}: {type(e).__name__}: {e}")
         
-        report = f"""# 网站与Figma设计相似度报告
+        parts = []
+        parts.append(f"""# 网站与Figma设计相似度报告
 
 ## 基本信息
 - **Figma地址**: {comparison_result.get('figma_url', 'N/A')}
@@ -750,7 +993,7 @@ class WorkflowExecutor:
 - **结构相似性(SSIM)**: {comp_data.get('ssim_score', 0):.3f}
 - **均方误差(MSE)**: {comp_data.get('mse_score', 0):.2f}
 - **感知哈希距离**: {comp_data.get('hash_distance', 0)}
-- **差异区域数**: {comp_data.get('differences_count', 0)}"""
+- **差异区域数**: {comp_data.get('differences_count', 0)}""")
 
         # 添加详细分析信息（如果可用）
         if detailed_analysis:
@@ -758,19 +1001,19 @@ class WorkflowExecutor:
             total_diff_area = detailed_analysis.get('total_diff_area', 0)
             color_analysis = detailed_analysis.get('color_analysis', {})
             
-            report += f"""
+            parts.append(f"""
 
 ## 详细分析
 - **差异百分比**: {diff_percentage:.2f}%
 - **差异区域面积**: {total_diff_area} 像素
-- **颜色差异**: 最大差异 {color_analysis.get('max_color_diff', 0):.2f}"""
+- **颜色差异**: 最大差异 {color_analysis.get('max_color_diff', 0):.2f}""")
 
         # 获取图片URL
         figma_image_url = get_image_url(comparison_result.get('figma_screenshot'))
         website_image_url = get_image_url(comparison_result.get('website_screenshot'))
         diff_image_url = get_image_url(comp_data.get('diff_image_path'))
 
-        report += f"""
+        parts.append(f"""
 
 ## 对比图片
 - **Figma设计稿**: {figma_image_url or '无法访问'}
@@ -779,23 +1022,22 @@ class WorkflowExecutor:
 
 ## 文件路径
 - **输出目录**: {comparison_result.get('output_directory', 'N/A')}
-- **详细报告**: {comparison_result.get('report_path', 'N/A')}"""
+- **详细报告**: {comparison_result.get('report_path', 'N/A')}""")
 
         # 添加AI建议部分
         if recommendations:
-            report += f"""
+            parts.append("""
 
 ## AI 分析建议
-"""
-            for i, rec in enumerate(recommendations, 1):
-                report += f"- {rec}\n"
+""")
+            parts.extend(f"- {rec}\n" for rec in recommendations)
         
-        report += f"""
+        parts.append(f"""
 
 ## 分析结论
 {self._get_comparison_conclusion(comp_data.get('similarity_score', 0))}
-"""
-        return report
+""")
+        return "".join(parts)
     
     def _get_similarity_rating(self, score: float) -> str:
         """获取相似度评级"""
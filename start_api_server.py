@@ -5,9 +5,15 @@ API Server Startup Script
 """
 import os
 import sys
-import subprocess
-import time
-from pathlib import Path
+import argparse
+
+# 启动服务所需的环境变量
+REQUIRED_ENV_VARS = frozenset({
+    'FEISHU_APP_ID',
+    'FEISHU_APP_SECRET',
+    'FIGMA_ACCESS_TOKEN',
+    'GEMINI_API_KEY'
+})
 
 def check_environment():
     """检查环境和依赖"""
@@ -21,18 +27,8 @@ def check_environment():
     
     print(f"✅ Python版本: {python_version.major}.{python_version.minor}.{python_version.micro}")
     
-    # 检查必要的环境变量
-    required_env_vars = [
-        'FEISHU_APP_ID',
-        'FEISHU_APP_SECRET',
-        'FIGMA_ACCESS_TOKEN',
-        'GEMINI_API_KEY'
-    ]
-    
-    missing_vars = []
-    for var in required_env_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
+    # 检查必要的环境变量（空值同样视为缺失）
+    missing_vars = sorted(var for var in REQUIRED_ENV_VARS if not os.environ.get(var))
     
     if missing_vars:
         print(f"⚠️  缺少环境变量: {', '.join(missing_vars)}")
@@ -42,6 +38,7 @@ def check_environment():
     print("✅ 环境变量检查完成")
     
     # 检查日志目录
+    from pathlib import Path
     log_dir = Path('logs')
     log_dir.mkdir(exist_ok=True)
     print("✅ 日志目录准备完成")
@@ -50,6 +47,7 @@ def check_environment():
 
 def install_dependencies():
     """安装依赖"""
+    import subprocess
     print("📦 安装依赖...")
     try:
         subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
@@ -72,7 +70,8 @@ def start_server(host='0.0.0.0', port=5001, debug=False):
     
     try:
         # 导入并运行服务器
-        from api_server import app
+        from api_server import app, configure_gc
+        configure_gc()
         app.run(host=host, port=port, debug=debug)
     except ImportError as e:
         print(f"❌ 导入错误: {e}")
@@ -81,8 +80,25 @@ def start_server(host='0.0.0.0', port=5001, debug=False):
         print(f"❌ 服务器启动失败: {e}")
         return False
 
+def prompt_or_default(message, default):
+    """交互终端中提示输入，非交互环境（CI、重定向stdin）直接使用默认值"""
+    if not sys.stdin.isatty():
+        return default
+    return input(message).strip() or default
+
+def parse_args():
+    """解析命令行参数，已指定的参数不再交互询问"""
+    parser = argparse.ArgumentParser(description="飞书自动化测试API服务器 / Feishu Auto Testing API Server")
+    parser.add_argument('--host', help="监听地址 (默认: 0.0.0.0)")
+    parser.add_argument('--port', type=int, help="监听端口 (默认: 5001)")
+    parser.add_argument('--debug', action='store_true', default=None, help="启用调试模式")
+    parser.add_argument('--no-install', action='store_true', help="跳过依赖安装")
+    return parser.parse_args()
+
 def main():
     """主函数"""
+    args = parse_args()
+    
     print("=" * 60)
     print("🌟 飞书自动化测试API服务器 🌟")
     print("=" * 60)
@@ -93,16 +109,20 @@ def main():
         sys.exit(1)
     
     # 询问是否安装依赖
-    install_deps = input("是否安装/更新依赖？(y/n): ").lower().strip()
-    if install_deps in ['y', 'yes', '是']:
-        if not install_dependencies():
-            print("❌ 依赖安装失败")
-            sys.exit(1)
-    
-    # 获取启动参数
-    host = input("输入监听地址 (默认: 0.0.0.0): ").strip() or '0.0.0.0'
-    port = input("输入监听端口 (默认: 5001): ").strip() or '5001'
-    debug = input("是否启用调试模式？(y/n): ").lower().strip() in ['y', 'yes', '是']
+    if not args.no_install:
+        install_deps = prompt_or_default("是否安装/更新依赖？(y/n): ", 'n').lower()
+        if install_deps in ['y', 'yes', '是']:
+            if not install_dependencies():
+                print("❌ 依赖安装失败")
+                sys.exit(1)
+    
+    # 获取启动参数（命令行未指定时再询问）
+    host = args.host or prompt_or_default("输入监听地址 (默认: 0.0.0.0): ", '0.0.0.0')
+    port = args.port if args.port is not None else prompt_or_default("输入监听端口 (默认: 5001): ", '5001')
+    if args.debug is not None:
+        debug = args.debug
+    else:
+        debug = prompt_or_default("是否启用调试模式？(y/n): ", 'n').lower() in ['y', 'yes', '是']
     
     try:
         port = int(port)